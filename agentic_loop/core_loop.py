@@ -156,12 +156,13 @@ def run_react_loop(
         # Log why this tool was selected
         logger.info(f"Tool selected: '{tool_name}' (based on thought above)")
         
-        # Truncate args for security in logs
-        args_str = str(tool_args)
-        if len(args_str) > 500:
-            args_str = args_str[:500] + "... (truncated)"
         logger.info(f"Executing tool '{tool_name}' with {len(tool_args)} arguments")
-        logger.debug(f"Tool arguments: {args_str}")
+        if logger.isEnabledFor(logging.DEBUG):
+            # Truncate args for security in logs
+            args_str = str(tool_args)
+            if len(args_str) > 500:
+                args_str = args_str[:500] + "... (truncated)"
+            logger.debug(f"Tool arguments: {args_str}")
         
         # Execute tool and add observation
         if tool_name in tool_registry.get_all_tools():
@@ -172,19 +173,21 @@ def run_react_loop(
                     session=session,
                     **tool_args
                 )
-                # Log tool observation (truncated for readability)
+                # Log tool observation (truncated for readability). The result
+                # is stringified once and every preview below slices that copy.
                 result_str = str(result)
                 if len(result_str) > 500:
                     result_preview = result_str[:500] + "... (truncated)"
                 else:
                     result_preview = result_str
                 logger.info(f"Tool observation from '{tool_name}': {result_preview}")
-                logger.debug(f"Full tool result: {result}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Full tool result: {result_str}")
                 
                 # Demo logging for tool result
                 if verbose:
-                    result_str = str(result)[:100] + "..." if len(str(result)) > 100 else str(result)
-                    print(f"  📊 Result: {result_str}")
+                    short_result = result_str[:100] + "..." if len(result_str) > 100 else result_str
+                    print(f"  📊 Result: {short_result}")
                     print()
                 
                 execution_time = (time.time() - iteration_start) * 1000
@@ -242,6 +245,17 @@ def run_react_loop(
     return message_list
 
 
+class AnswerExtractionSignature(dspy.Signature):
+    """Extract a clear, concise answer from the gathered information."""
+    user_query: str = dspy.InputField(desc="The user's original question")
+    answer: str = dspy.OutputField(desc="Clear, direct answer to the user's question")
+
+
+# The Extract Agent holds no per-call state (the LM is read from DSPy settings
+# on every call), so one instance serves every extraction.
+_ANSWER_EXTRACTOR = ReactExtract(signature=AnswerExtractionSignature)
+
+
 def extract_final_answer(
     messages: MessageList,
     user_query: str,
@@ -268,14 +282,8 @@ def extract_final_answer(
     message_list = messages
     
     logger.debug("Extracting final answer from message list")
-    logger.debug(f"Message list has {message_list.iteration_count} iterations")
-    
-    # Create a signature for answer extraction
-    # This defines the contract for the Extract Agent
-    class AnswerExtractionSignature(dspy.Signature):
-        """Extract a clear, concise answer from the gathered information."""
-        user_query: str = dspy.InputField(desc="The user's original question")
-        answer: str = dspy.OutputField(desc="Clear, direct answer to the user's question")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Message list has {message_list.iteration_count} iterations")
     
     # Demo logging Extract Agent section
     if verbose:
@@ -283,12 +291,9 @@ def extract_final_answer(
         print("Extract Agent")
         print(f"{'='*80}")
     
-    # Initialize Extract Agent with Chain of Thought reasoning
-    extract_agent = ReactExtract(signature=AnswerExtractionSignature)
-    
     # Extract answer from message list
     logger.debug("Calling Extract Agent")
-    result = extract_agent(
+    result = _ANSWER_EXTRACTOR(
         message_list=message_list,
         user_query=user_query
     )
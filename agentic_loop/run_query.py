@@ -16,14 +16,16 @@ import os
 import logging
 import argparse
 from pathlib import Path
-from typing import Optional
+from typing import Optional, TYPE_CHECKING
 
 # Add project root to path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from shared import ConsoleFormatter, setup_llm
-from agentic_loop.session import AgentSession, SessionResult
+# The agent stack imports DSPy, which takes about a second; it is imported
+# inside the functions so argument errors and --help return immediately
+if TYPE_CHECKING:
+    from agentic_loop.session import AgentSession, SessionResult
 
 logging.basicConfig(level=logging.INFO, format='%(message)s')
 logger = logging.getLogger(__name__)
@@ -34,8 +36,8 @@ def run_query(
     tool_set_name: str = "agriculture",
     max_iterations: int = 10,
     verbose: Optional[bool] = None,
-    session: Optional[AgentSession] = None
-) -> SessionResult:
+    session: Optional["AgentSession"] = None
+) -> "SessionResult":
     """
     Execute a query through the agentic loop using AgentSession.
     
@@ -51,6 +53,9 @@ def run_query(
     Returns:
         SessionResult with trajectory, answer, and metadata
     """
+    from shared import setup_llm
+    from agentic_loop.session import AgentSession
+    
     # Determine verbosity
     if verbose is None:
         verbose = os.getenv("DEMO_VERBOSE", "false").lower() == "true"
@@ -116,6 +121,9 @@ Tool sets: agriculture, ecommerce, events
     # Get query from args or stdin
     if args.query:
         query = ' '.join(args.query)
+    elif sys.stdin.isatty():
+        # Nothing piped in - fail below instead of waiting for terminal input
+        query = ""
     else:
         # Read from stdin
         query = sys.stdin.read().strip()
@@ -125,6 +133,8 @@ Tool sets: agriculture, ecommerce, events
         logger.error("Provide a query as an argument or via stdin")
         sys.exit(1)
     
+    from shared import ConsoleFormatter
+    
     # Determine verbosity
     verbose = args.verbose or os.getenv("DEMO_VERBOSE", "false").lower() == "true"
     
@@ -29,6 +29,24 @@ from agentic_loop.extract_agent import ReactExtract
 logger = logging.getLogger(__name__)
 
 
+# Context-aware signatures, defined once rather than per session
+class ContextAwareReactSignature(dspy.Signature):
+    """React agent signature with conversation context."""
+    user_query = dspy.InputField(desc="The user's current question or task")
+    conversation_context = dspy.InputField(
+        desc="Context from previous interactions (may be empty for first query)"
+    )
+
+
+class ContextAwareExtractSignature(dspy.Signature):
+    """Extract agent signature with conversation context."""
+    user_query = dspy.InputField(desc="The user's current question or task")
+    conversation_context = dspy.InputField(
+        desc="Context from previous interactions (may be empty for first query)"
+    )
+    answer = dspy.OutputField(desc="Clear, direct answer to the user's question")
+
+
 class SessionResult(BaseModel):
     """
     Type-safe result from an agent query using MessageList.
@@ -146,8 +164,7 @@ class AgentSession:
         self.conversation_turn += 1
         
         # Get context from history
-        context = self.history.get_context_for_agent()
-        context_prompt = self.history.build_context_prompt(context)
+        context_prompt = self.history.build_context_prompt()
         
         # Create message list
         messages = MessageList(
@@ -156,7 +173,7 @@ class AgentSession:
             max_iterations=max_iterations,
             metadata={
                 "conversation_turn": self.conversation_turn,
-                "has_context": len(context["messages"]) > 0,
+                "has_context": len(self.history.messages) > 0,
                 "context_size": len(context_prompt),
                 "session_id": self.session_id
             }
@@ -274,37 +291,27 @@ class AgentSession:
     
     def _setup_tools(self) -> ToolRegistry:
         """Setup the tool registry with the specified tool set."""
-        registry = ToolRegistry()
-        
-        # Import and register the appropriate tool set
+        # Import the appropriate tool set and register it as the registry is built
         if self.tool_set_name == "agriculture":
             from tools.precision_agriculture.tool_set import AgricultureToolSet
-            registry.register_tool_set(AgricultureToolSet())
+            tool_set = AgricultureToolSet()
         elif self.tool_set_name == "ecommerce":
             from tools.ecommerce.tool_set import EcommerceToolSet
-            registry.register_tool_set(EcommerceToolSet())
+            tool_set = EcommerceToolSet()
         elif self.tool_set_name == "events":
             from tools.events.tool_set import EventsToolSet
-            registry.register_tool_set(EventsToolSet())
+            tool_set = EventsToolSet()
         elif self.tool_set_name == "real_estate_mcp":
             from tools.real_estate.mcp_tool_set import RealEstateMCPToolSet
             # MCP tools use dynamic discovery from the server
-            registry.register_tool_set(RealEstateMCPToolSet(server_url="http://localhost:8000/mcp"))
+            tool_set = RealEstateMCPToolSet(server_url="http://localhost:8000/mcp")
         else:
             raise ValueError(f"Unknown tool set: {self.tool_set_name}")
         
-        return registry
+        return ToolRegistry(tool_set)
     
     def _setup_react_agent(self) -> ReactAgent:
         """Setup the React agent with context-aware signature."""
-        # Define context-aware signature
-        class ContextAwareReactSignature(dspy.Signature):
-            """React agent signature with conversation context."""
-            user_query = dspy.InputField(desc="The user's current question or task")
-            conversation_context = dspy.InputField(
-                desc="Context from previous interactions (may be empty for first query)"
-            )
-        
         return ReactAgent(
             signature=ContextAwareReactSignature,
             tool_registry=self.tool_registry
@@ -312,15 +319,6 @@ class AgentSession:
     
     def _setup_extract_agent(self) -> ReactExtract:
         """Setup the Extract agent with context-aware signature."""
-        # Define context-aware signature
-        class ContextAwareExtractSignature(dspy.Signature):
-            """Extract agent signature with conversation context."""
-            user_query = dspy.InputField(desc="The user's current question or task")
-            conversation_context = dspy.InputField(
-                desc="Context from previous interactions (may be empty for first query)"
-            )
-            answer = dspy.OutputField(desc="Clear, direct answer to the user's question")
-        
         return ReactExtract(signature=ContextAwareExtractSignature)
     
     def _default_config(self) -> Dict[str, Any]:
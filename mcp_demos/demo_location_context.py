@@ -16,6 +16,11 @@ sys.path.insert(0, str(project_root))
 from shared.tool_utils.registry import ToolRegistry
 from shared.models import ToolCall
 from tools.real_estate.mcp_tool_set import RealEstateMCPToolSet
+from shared.demo_utils import buffered_stdout
+from tools.real_estate.result_parsing import (
+    first, LIST_KEYS, ARTICLE_LIST_KEYS, TOTAL_KEYS, TYPE_KEYS, DESCRIPTION_KEYS,
+    TITLE_KEYS, SUMMARY_KEYS
+)
 
 
 def explore_location(registry: ToolRegistry, city: str, state: str) -> Dict[str, Any]:
@@ -49,7 +54,7 @@ def explore_location(registry: ToolRegistry, city: str, state: str) -> Dict[str,
         if isinstance(wiki_result.result, str):
             try:
                 results["wikipedia_info"] = json.loads(wiki_result.result)
-            except:
+            except json.JSONDecodeError:
                 results["wikipedia_info"] = {"raw": wiki_result.result}
         else:
             results["wikipedia_info"] = wiki_result.result
@@ -72,7 +77,7 @@ def explore_location(registry: ToolRegistry, city: str, state: str) -> Dict[str,
         if isinstance(property_result.result, str):
             try:
                 results["properties"] = json.loads(property_result.result)
-            except:
+            except json.JSONDecodeError:
                 results["properties"] = {"raw": property_result.result}
         else:
             results["properties"] = property_result.result
@@ -102,7 +107,7 @@ def explore_location(registry: ToolRegistry, city: str, state: str) -> Dict[str,
         if isinstance(neighborhood_result.result, str):
             try:
                 results["neighborhood_insights"] = json.loads(neighborhood_result.result)
-            except:
+            except json.JSONDecodeError:
                 results["neighborhood_insights"] = {"raw": neighborhood_result.result}
         else:
             results["neighborhood_insights"] = neighborhood_result.result
@@ -130,10 +135,10 @@ def display_location_summary(location_data: Dict[str, Any]) -> None:
         
         wiki = location_data["wikipedia_info"]
         if isinstance(wiki, dict) and "articles" in wiki:
-            articles = wiki.get("articles", wiki.get("results", []))
+            articles = first(wiki, ARTICLE_LIST_KEYS, [])
             for article in articles[:3]:
-                title = article.get("title", article.get("name", ""))
-                summary = article.get("summary", article.get("content", ""))
+                title = first(article, TITLE_KEYS, "")
+                summary = first(article, SUMMARY_KEYS, "")
                 if title:
                     print(f"\n• {title}")
                     if summary:
@@ -148,8 +153,8 @@ def display_location_summary(location_data: Dict[str, Any]) -> None:
         
         props = location_data["properties"]
         if isinstance(props, dict):
-            total = props.get("total_results", props.get("total", 0))
-            properties = props.get("properties", props.get("results", []))
+            total = first(props, TOTAL_KEYS, 0)
+            properties = first(props, LIST_KEYS, [])
             
             if total:
                 print(f"• {total} properties currently available")
@@ -168,7 +173,7 @@ def display_location_summary(location_data: Dict[str, Any]) -> None:
                 # Property type distribution
                 types = {}
                 for p in properties:
-                    ptype = p.get("property_type", p.get("type", "Unknown"))
+                    ptype = first(p, TYPE_KEYS, "Unknown")
                     types[ptype] = types.get(ptype, 0) + 1
                 
                 if types:
@@ -183,11 +188,11 @@ def display_location_summary(location_data: Dict[str, Any]) -> None:
         
         insights = location_data["neighborhood_insights"]
         if isinstance(insights, dict):
-            properties = insights.get("properties", insights.get("results", []))
+            properties = first(insights, LIST_KEYS, [])
             if properties:
                 print(f"• Found {len(properties)} family-friendly options")
                 for prop in properties[:2]:
-                    desc = prop.get("description", prop.get("summary", ""))
+                    desc = first(prop, DESCRIPTION_KEYS, "")
                     if desc:
                         print(f"  - {desc[:100]}...")
 
@@ -205,7 +210,6 @@ def demo_location_context():
     registry = ToolRegistry()
     mcp_tools = RealEstateMCPToolSet(server_url="http://localhost:8000/mcp")
     registry.register_tool_set(mcp_tools)
-    
     print(f"✅ Connected to MCP server with location-aware tools")
     
     # Locations to explore
@@ -234,6 +238,7 @@ def demo_location_context():
         display_location_summary(location_data)
         
         print(f"\n⏱️ Analysis completed in {datetime.now().strftime('%H:%M:%S')}")
+        sys.stdout.flush()
     
     # Cross-location comparison
     print(f"\n{'='*70}")
@@ -279,7 +284,8 @@ def demo_location_context():
 
 if __name__ == "__main__":
     try:
-        demo_location_context()
+        with buffered_stdout():
+            demo_location_context()
     except Exception as e:
         print(f"\n❌ Demo error: {e}")
         print("   Make sure the MCP server is running at http://localhost:8000/mcp")
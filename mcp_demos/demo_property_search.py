@@ -3,10 +3,11 @@
 This demo showcases how MCP tools work with direct execution,
 simulating an agent-like interaction for property searches.
 """
+import re
 import sys
-import json
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
 # Add project root to path
@@ -16,174 +17,249 @@ sys.path.insert(0, str(project_root))
 from shared.tool_utils.registry import ToolRegistry
 from shared.models import ToolCall
 from tools.real_estate.mcp_tool_set import RealEstateMCPToolSet
+from tools.real_estate.result_parsing import (
+    as_dict, first, load_json_items, preview_json,
+    LIST_KEYS, ARTICLE_LIST_KEYS, TOTAL_KEYS, TYPE_KEYS, BED_KEYS, BATH_KEYS, SQFT_KEYS,
+    DESCRIPTION_KEYS, ADDRESS_KEYS, TITLE_KEYS, SUMMARY_KEYS
+)
+from tools.real_estate.lookup_cache import wikipedia_cache
+from shared.demo_utils import buffered_stdout
 
 
-def execute_search_query(registry: ToolRegistry, query: str, context: str) -> Dict:
-    """Execute a property search query using MCP tools."""
+BAR = "=" * 70
+
+# Routing keywords and the flag each one sets. All of them are matched in a
+# single scan of the casefolded query, which yields a bitmask to route on.
+# Substring matching (rather than splitting into words) is deliberate: it
+# covers plurals, punctuation such as "Oakland," and multi-word phrases.
+_NEIGHBORHOOD = 1
+_TEMESCAL = 2
+_OAKLAND = 4
+_DESCRIPTIVE = 8
+_KEYWORD_FLAGS = {
+    "neighborhood": _NEIGHBORHOOD,
+    "neighbourhood": _NEIGHBORHOOD,
+    "tell me about": _NEIGHBORHOOD,
+    "temescal": _TEMESCAL,
+    "oakland": _OAKLAND,
+    "luxury": _DESCRIPTIVE,
+    "luxurious": _DESCRIPTIVE,
+    "stunning": _DESCRIPTIVE,
+}
+_KEYWORD_PATTERN = re.compile("|".join(map(re.escape, _KEYWORD_FLAGS)))
+_PRICE_CEILING_PATTERN = re.compile(
+    r"(?:\b(?:under|below)\s+|(<)\s*)(\$)?(\d[\d,]*(?:\.\d+)?)\s*(k|m|million)?\b"
+)
+_PRICE_UNITS = {"": 1, "k": 1_000, "m": 1_000_000, "million": 1_000_000}
+# An amount with no "$" or unit is only a price from this value up, so
+# "under 20 minutes" or "under 10 years old" set no ceiling. After "<" a "$"
+# or unit is always required: "< 2 miles" is a distance.
+_BARE_PRICE_FLOOR = 10_000
+
+# Argument templates; builders merge in the query-specific fields
+_OAKLAND_WIKI_ARGS = {"city": "Oakland", "state": "CA", "size": 3}
+_WIKI_ARGS = {"size": 3}
+_SEMANTIC_ARGS = {"search_type": "semantic", "size": 3}
+_PROPERTY_ARGS = {"size": 5}
+
+# Response templates for format_property_result
+_RESULTS_HEADER = "I found {} properties matching your search. Here are the top results:\n\n"
+_PROPERTY_TITLE = "{}. {} - ${:,.0f}\n"
+_PROPERTY_ADDRESS = "   📐 {}\n"
+_PROPERTY_SPECS = "   {} bed, {} bath, {:,} sqft\n"
+_PROPERTY_DESCRIPTION = "   {}...\n"
+
+# Demo queries that tell a story
+DEMO_QUERIES = (
+    {
+        "query": "I'm looking for a modern family home with a pool in Oakland, ideally under $900k",
+        "context": "First-time homebuyer searching for family home"
+    },
+    {
+        "query": "Tell me about the Temescal neighborhood in Oakland",
+        "context": "Researching neighborhoods"
+    },
+    {
+        "query": "Find luxury properties with stunning views and modern kitchens",
+        "context": "Exploring luxury market"
+    },
+    {
+        "query": "Show me cozy cottages with character, perfect for a young couple",
+        "context": "Looking for starter home with personality"
+    },
+    {
+        "query": "What are the best properties near good schools and parks?",
+        "context": "Family-focused property search"
+    }
+)
+
+
+def _keyword_mask(lowered: str) -> int:
+    """Bitmask of routing keywords in an already casefolded query."""
+    mask = 0
+    for match in _KEYWORD_PATTERN.finditer(lowered):
+        mask |= _KEYWORD_FLAGS[match.group()]
+    return mask
+
+
+def _max_price(lowered: str) -> Optional[int]:
+    """Price ceiling in an already casefolded query."""
+    for match in _PRICE_CEILING_PATTERN.finditer(lowered):
+        less_than, dollar, amount, unit = match.groups()
+        price = float(amount.replace(",", "")) * _PRICE_UNITS[unit or ""]
+        if dollar or unit or (not less_than and price >= _BARE_PRICE_FLOOR):
+            return round(price)
+    return None
+
+
+def parse_max_price(query: str) -> Optional[int]:
+    """Extract a price ceiling such as "under $900k", "below 1.2 million" or "< $750,000" from a query."""
+    return _max_price(query.casefold())
+
+
+def _build_wiki_call(query: str, lowered: str, mask: int) -> Tuple[str, Dict[str, Any]]:
+    """Build a Wikipedia lookup for neighborhood questions."""
+    if mask & (_TEMESCAL | _OAKLAND):
+        topic = "Temescal neighborhood history culture" if mask & _TEMESCAL else "neighborhoods history"
+        return "search_wikipedia_by_location_tool", _OAKLAND_WIKI_ARGS | {"query": topic}
+    return "search_wikipedia_tool", _WIKI_ARGS | {"query": query}
+
+
+def _build_semantic_call(query: str, lowered: str, mask: int) -> Tuple[str, Dict[str, Any]]:
+    """Build a natural language search for descriptive queries."""
+    return "natural_language_search_tool", _SEMANTIC_ARGS | {"query": query}
+
+
+def _build_property_call(query: str, lowered: str, mask: int) -> Tuple[str, Dict[str, Any]]:
+    """Build a property search, bounding the price if one is mentioned."""
+    args = _PROPERTY_ARGS | {"query": query}
+    max_price = _max_price(lowered)
+    if max_price is not None:
+        args["max_price"] = max_price
+        args["min_price"] = max_price * 0.5  # Set a reasonable min price
+    return "search_properties_tool", args
+
+
+# Query routing table, checked in order; new tools plug in by adding an entry.
+# Queries matching none of the flags fall back to a property search.
+_DISPATCH = [
+    (_NEIGHBORHOOD, _build_wiki_call),
+    (_DESCRIPTIVE, _build_semantic_call),
+]
+
+
+@lru_cache(maxsize=256)
+def _route(query: str) -> Tuple[str, Tuple[Tuple[str, Any], ...]]:
+    """Pick the tool and arguments for a query.
     
-    # Determine which tool to use based on query content
-    if "neighborhood" in query.lower() or "tell me about" in query.lower():
-        # Use Wikipedia search for neighborhood info
-        if "temescal" in query.lower() or "oakland" in query.lower():
-            tool_name = "search_wikipedia_by_location_tool"
-            tool_call = ToolCall(
-                tool_name=tool_name,
-                arguments={
-                    "city": "Oakland",
-                    "state": "CA",
-                    "query": "Temescal neighborhood history culture" if "temescal" in query.lower() else "neighborhoods history",
-                    "size": 3
-                }
-            )
-        else:
-            tool_name = "search_wikipedia_tool"
-            tool_call = ToolCall(
-                tool_name=tool_name,
-                arguments={
-                    "query": query,
-                    "size": 3
-                }
-            )
-    elif "luxury" in query.lower() or "stunning" in query.lower():
-        # Use natural language search for descriptive queries
-        tool_name = "natural_language_search_tool"
-        tool_call = ToolCall(
-            tool_name=tool_name,
-            arguments={
-                "query": query,
-                "search_type": "semantic",
-                "size": 3
-            }
-        )
+    Routing is a pure function of the query text, so results are memoized;
+    arguments are returned as a tuple of items to keep the cached value
+    immutable.
+    """
+    lowered = query.casefold()
+    mask = _keyword_mask(lowered)
+    for flag, builder in _DISPATCH:
+        if mask & flag:
+            tool_name, args = builder(query, lowered, mask)
+            break
     else:
-        # Use property search for home queries
-        tool_name = "search_properties_tool"
-        
-        # Extract price if mentioned
-        max_price = None
-        min_price = None
-        if "under" in query.lower():
-            # Simple price extraction
-            if "800k" in query.lower():
-                max_price = 800000
-            elif "900k" in query.lower():
-                max_price = 900000
-            elif "1m" in query.lower() or "million" in query.lower():
-                max_price = 1000000
-        
-        # Build arguments
-        args = {"query": query, "size": 5}
-        if max_price is not None:
-            args["max_price"] = max_price
-            args["min_price"] = max_price * 0.5  # Set a reasonable min price
-            
-        tool_call = ToolCall(
-            tool_name=tool_name,
-            arguments=args
-        )
+        tool_name, args = _build_property_call(query, lowered, mask)
+    return tool_name, tuple(args.items())
+
+
+def build_tool_call(query: str) -> ToolCall:
+    """Pick the tool for a query and build its call.
     
-    # Execute the tool
-    result = registry.execute_tool(tool_call)
+    The query is casefolded once; keyword routing and price extraction both
+    work on that copy while the original text is passed on to the tools.
+    Repeated queries are answered from the routing cache.
+    """
+    tool_name, args = _route(query)
+    return ToolCall(tool_name=tool_name, arguments=dict(args))
+
+
+def execute_search_queries(registry: ToolRegistry, queries: List[str]) -> List[Dict]:
+    """Execute independent search queries together.
     
-    return {
-        "tool_used": tool_name,
-        "success": result.success,
-        "result": result.result if result.success else result.error,
-        "execution_time": result.execution_time
-    }
+    Cached Wikipedia lookups are answered locally and the remaining calls go
+    to the server as one batch, so the queries cost roughly one round-trip.
+    """
+    tool_calls = [build_tool_call(query) for query in queries]
+    results = wikipedia_cache.execute_batch(registry.execute_tools, tool_calls)
+    return [
+        {
+            "tool_used": tool_call.tool_name,
+            "success": result.success,
+            "result": result.result if result.success else result.error,
+            "execution_time": result.execution_time
+        }
+        for tool_call, result in zip(tool_calls, results)
+    ]
 
 
 def format_property_result(result: Any) -> str:
     """Format property search results as a friendly response."""
-    if isinstance(result, str):
-        try:
-            result = json.loads(result)
-        except:
-            return result[:500]
-    
-    if not isinstance(result, dict):
+    data = as_dict(result)
+    if not data and not isinstance(result, dict):
+        # Not a JSON object - show the raw text instead
         return str(result)[:500]
     
-    properties = result.get('properties', result.get('results', []))
-    total = result.get('total_results', result.get('total', len(properties)))
+    properties = first(data, LIST_KEYS, [])
+    total = first(data, TOTAL_KEYS, len(properties))
     
     if not properties:
         return "I couldn't find any properties matching your criteria. Try broadening your search."
     
-    response = f"I found {total} properties matching your search. Here are the top results:\n\n"
+    parts = [_RESULTS_HEADER.format(total)]
+    append = parts.append
     
     for i, prop in enumerate(properties[:3], 1):
-        prop_type = prop.get('property_type', prop.get('type', 'Property'))
+        prop_type = first(prop, TYPE_KEYS, 'Property')
         price = prop.get('price', 0)
-        bedrooms = prop.get('bedrooms', prop.get('beds', 0))
-        bathrooms = prop.get('bathrooms', prop.get('baths', 0))
-        sqft = prop.get('square_feet', prop.get('sqft', 0))
-        desc = prop.get('description', prop.get('summary', ''))
-        address = prop.get('address', prop.get('location', ''))
+        bedrooms = first(prop, BED_KEYS, 0)
+        bathrooms = first(prop, BATH_KEYS, 0)
+        sqft = first(prop, SQFT_KEYS, 0)
+        desc = first(prop, DESCRIPTION_KEYS, '')
+        address = first(prop, ADDRESS_KEYS, '')
         
-        response += f"{i}. {prop_type.title()} - ${price:,.0f}\n"
+        append(_PROPERTY_TITLE.format(i, prop_type.title(), price))
         if address:
-            response += f"   📐 {address}\n"
-        response += f"   {bedrooms} bed, {bathrooms} bath, {sqft:,} sqft\n"
+            append(_PROPERTY_ADDRESS.format(address))
+        append(_PROPERTY_SPECS.format(bedrooms, bathrooms, sqft))
         if desc:
-            response += f"   {desc[:100]}...\n"
-        response += "\n"
+            append(_PROPERTY_DESCRIPTION.format(desc[:100]))
+        append("\n")
     
-    return response
+    return "".join(parts)
 
 
 def demo_property_search():
     """Demonstrate property search using MCP tools."""
     
-    print("\n" + "="*70)
+    print("\n" + BAR)
     print("DEMO: Property Search with MCP Tools")
-    print("="*70)
+    print(BAR)
     
     # Initialize MCP tools
     print("\n🔧 Setting up MCP tools from server...")
     registry = ToolRegistry()
     mcp_tools = RealEstateMCPToolSet(server_url="http://localhost:8000/mcp")
     registry.register_tool_set(mcp_tools)
-    
     available_tools = registry.get_tool_names()
     print(f"✅ Connected to MCP server with {len(available_tools)} tools available")
     
     # Create simulated agent interaction
     print("\n🤖 Ready to help you find your dream home...")
     
-    # Demo queries that tell a story
-    queries = [
-        {
-            "query": "I'm looking for a modern family home with a pool in Oakland, ideally under $900k",
-            "context": "First-time homebuyer searching for family home"
-        },
-        {
-            "query": "Tell me about the Temescal neighborhood in Oakland",
-            "context": "Researching neighborhoods"
-        },
-        {
-            "query": "Find luxury properties with stunning views and modern kitchens",
-            "context": "Exploring luxury market"
-        },
-        {
-            "query": "Show me cozy cottages with character, perfect for a young couple",
-            "context": "Looking for starter home with personality"
-        },
-        {
-            "query": "What are the best properties near good schools and parks?",
-            "context": "Family-focused property search"
-        }
-    ]
+    # Execute all queries using MCP tools, then walk through the answers
+    answers = execute_search_queries(registry, [item['query'] for item in DEMO_QUERIES])
     
-    for i, item in enumerate(queries, 1):
-        print(f"\n{'='*70}")
+    for i, (item, result) in enumerate(zip(DEMO_QUERIES, answers), 1):
+        print(f"\n{BAR}")
         print(f"Query {i}: {item['context']}")
-        print(f"{'='*70}")
+        print(BAR)
         print(f"\n💭 User: {item['query']}")
         
-        # Execute query using MCP tools
-        result = execute_search_query(registry, item['query'], item['context'])
-        
         if result['success']:
             # Format the response based on tool used
             if result['tool_used'] in ['search_properties_tool', 'natural_language_search_tool']:
@@ -192,30 +268,27 @@ def demo_property_search():
                 # Format Wikipedia results
                 wiki_result = result['result']
                 if isinstance(wiki_result, str):
-                    try:
-                        wiki_result = json.loads(wiki_result)
-                    except:
-                        response = f"Here's what I found:\n{wiki_result[:500]}..."
+                    # Only the first two articles are shown
+                    articles = load_json_items(wiki_result, ARTICLE_LIST_KEYS, 2)
+                    if articles:
+                        parts = [f"Here's what I found about {item['query']}:\n\n"]
+                        for article in articles:
+                            title = first(article, TITLE_KEYS, 'Article')
+                            summary = first(article, SUMMARY_KEYS, '')
+                            url = article.get('url', '')
+                            parts.append(f"📚 {title}\n")
+                            if url:
+                                parts.append(f"   🔗 {url}\n")
+                            parts.append(f"   {summary[:200]}...\n\n")
+                        response = "".join(parts)
                     else:
-                        articles = wiki_result.get('articles', wiki_result.get('results', []))
-                        if articles:
-                            response = f"Here's what I found about {item['query']}:\n\n"
-                            for article in articles[:2]:
-                                title = article.get('title', article.get('name', 'Article'))
-                                summary = article.get('summary', article.get('content', article.get('description', '')))
-                                url = article.get('url', '')
-                                response += f"📚 {title}\n"
-                                if url:
-                                    response += f"   🔗 {url}\n"
-                                response += f"   {summary[:200]}...\n\n"
-                        else:
-                            response = "I found information about this area. Let me know if you'd like more details."
+                        response = f"Here's what I found:\n{wiki_result[:500]}..."
                 else:
                     response = str(wiki_result)[:500]
             else:
                 # Handle other tool responses
                 if isinstance(result['result'], dict):
-                    response = json.dumps(result['result'], indent=2)[:500] + "..."
+                    response = preview_json(result['result']) + "..."
                 else:
                     response = str(result['result'])[:500]
             
@@ -226,12 +299,13 @@ def demo_property_search():
         # Show tool used
         print(f"\n📊 Tool used: {result['tool_used']}")
         print(f"⏱️  Response time: {result['execution_time']:.3f} seconds")
+        sys.stdout.flush()
     
     # Show session summary
-    print(f"\n{'='*70}")
+    print(f"\n{BAR}")
     print("DEMO SUMMARY")
-    print(f"{'='*70}")
-    print(f"✅ Successfully processed {len(queries)} property-related queries")
+    print(BAR)
+    print(f"✅ Successfully processed {len(DEMO_QUERIES)} property-related queries")
     print(f"🔧 MCP tools provided real-time data from the server")
     print(f"🏡 Each query used the appropriate tool automatically:")
     print(f"   • Property search for home queries")
@@ -243,7 +317,8 @@ def demo_property_search():
 
 if __name__ == "__main__":
     try:
-        demo_property_search()
+        with buffered_stdout():
+            demo_property_search()
     except Exception as e:
         print(f"\n❌ Demo error: {e}")
         print("   Make sure the MCP server is running at http://localhost:8000/mcp")
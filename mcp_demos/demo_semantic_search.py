@@ -4,10 +4,8 @@ This demo showcases the natural language understanding capabilities
 of MCP tools using semantic search for intelligent property matching.
 """
 import sys
-import json
 from pathlib import Path
-from typing import Dict, List, Any
-from datetime import datetime
+from typing import Any
 
 # Add project root to path
 project_root = Path(__file__).parent.parent
@@ -16,66 +14,129 @@ sys.path.insert(0, str(project_root))
 from shared.tool_utils.registry import ToolRegistry
 from shared.models import ToolCall
 from tools.real_estate.mcp_tool_set import RealEstateMCPToolSet
+from shared.demo_utils import buffered_stdout
+from tools.real_estate.result_parsing import (
+    as_dict, preview_json, first,
+    LIST_KEYS, TYPE_KEYS, BED_KEYS, BATH_KEYS, SQFT_KEYS, DESCRIPTION_KEYS, ADDRESS_KEYS, SCORE_KEYS
+)
+
+
+BAR = "=" * 70
+DASH = "-" * 40
+
+# Scenario header, written in one call per scenario
+_SCENARIO_HEADER = f"\n{BAR}\nScenario {{}}: {{}}\n{BAR}\n\n💭 Natural Language Query:\n   \"{{}}\"\n"
+
+# Row templates for display_semantic_results
+_PROPERTY_TITLE = "{}. 🏠 {} - ${:,.0f}"
+_PROPERTY_ADDRESS = "   📍 {}"
+_PROPERTY_SPECS = "   {} bed, {} bath, {:,} sqft"
+_PROPERTY_SCORE = "   🎯 Match Score: [{}] {:.2%}"
+_PROPERTY_DESCRIPTION = "   📝 {}..."
+
+# Every match score bar, indexed by filled cells (0-10)
+_BARS = tuple("█" * filled + "░" * (10 - filled) for filled in range(11))
+
+# Validated once; each scenario clones it with model_copy and sets the query
+_SEMANTIC_SEARCH_CALL = ToolCall(
+    tool_name="natural_language_search_tool",
+    arguments={"query": "", "search_type": "semantic", "size": 3}
+)
+
+# Semantic search queries that test understanding
+SEMANTIC_QUERIES = (
+    {
+        "query": "I want a peaceful retreat with nature views where I can work from home and enjoy morning coffee on a deck",
+        "description": "Finding homes that match lifestyle preferences"
+    },
+    {
+        "query": "Something perfect for entertaining friends with an open floor plan and outdoor space for BBQs",
+        "description": "Social lifestyle and entertainment focus"
+    },
+    {
+        "query": "A cozy nest for a young professional near transit and coffee shops with modern amenities",
+        "description": "Urban convenience and modern living"
+    },
+    {
+        "query": "Family-friendly home with safe neighborhood, good schools, and space for kids to play",
+        "description": "Family needs and child-focused features"
+    },
+    {
+        "query": "Investment property with good rental potential in an up-and-coming neighborhood",
+        "description": "Investment focus and growth potential"
+    },
+    {
+        "query": "Eco-friendly home with solar panels, energy efficiency, and sustainable features",
+        "description": "Environmental consciousness and sustainability"
+    },
+    {
+        "query": "Historic charm with original details but updated kitchen and bathrooms",
+        "description": "Balance of character and modern updates"
+    },
+    {
+        "query": "Minimalist space with clean lines, lots of natural light, and low maintenance",
+        "description": "Aesthetic preferences and lifestyle simplicity"
+    }
+)
 
 
 def display_semantic_results(results: Any, query: str) -> None:
     """Display semantic search results with relevance scores."""
     print(f"\n🤖 AI Understanding: '{query}'")
-    print("-" * 40)
-    
-    if isinstance(results, str):
-        try:
-            data = json.loads(results)
-        except:
-            print(f"Raw results: {results[:500]}...")
-            return
-    else:
-        data = results
+    print(DASH)
+    
+    data = as_dict(results)
+    if not data and not isinstance(results, dict):
+        # Not a JSON object - show the raw text instead
+        print(f"Raw results: {str(results)[:500]}...")
+        return
+    
+    properties = first(data, LIST_KEYS, [])
     
-    if isinstance(data, dict):
-        properties = data.get('properties', data.get('results', []))
+    if properties:
+        lines = [f"✅ Found {len(properties)} semantically matching properties:\n"]
+        append = lines.append
         
-        if properties:
-            print(f"✅ Found {len(properties)} semantically matching properties:\n")
+        for i, prop in enumerate(properties, 1):
+            # Extract property details
+            prop_type = first(prop, TYPE_KEYS, 'Property')
+            price = prop.get('price', 0)
+            bedrooms = first(prop, BED_KEYS, 0)
+            bathrooms = first(prop, BATH_KEYS, 0)
+            sqft = first(prop, SQFT_KEYS, 0)
+            desc = first(prop, DESCRIPTION_KEYS, '')
+            address = first(prop, ADDRESS_KEYS, '')
+            score = first(prop, SCORE_KEYS, 0)
             
-            for i, prop in enumerate(properties, 1):
-                # Extract property details
-                prop_type = prop.get('property_type', prop.get('type', 'Property'))
-                price = prop.get('price', 0)
-                bedrooms = prop.get('bedrooms', prop.get('beds', 0))
-                bathrooms = prop.get('bathrooms', prop.get('baths', 0))
-                sqft = prop.get('square_feet', prop.get('sqft', 0))
-                desc = prop.get('description', prop.get('summary', ''))
-                address = prop.get('address', prop.get('location', ''))
-                score = prop.get('relevance_score', prop.get('score', prop.get('similarity', 0)))
-                
-                print(f"{i}. 🏠 {prop_type.title()} - ${price:,.0f}")
-                if address:
-                    print(f"   📍 {address}")
-                print(f"   {bedrooms} bed, {bathrooms} bath, {sqft:,} sqft")
-                
-                # Show relevance/match score if available
-                if score:
-                    bars = "█" * int(score * 10) + "░" * (10 - int(score * 10))
-                    print(f"   🎯 Match Score: [{bars}] {score:.2%}")
-                
-                if desc:
-                    print(f"   📝 {desc[:120]}...")
-                print()
-        else:
-            # No properties found, show raw data
-            print("No specific properties found. Raw response:")
-            print(json.dumps(data, indent=2)[:500] + "...")
+            append(_PROPERTY_TITLE.format(i, prop_type.title(), price))
+            if address:
+                append(_PROPERTY_ADDRESS.format(address))
+            append(_PROPERTY_SPECS.format(bedrooms, bathrooms, sqft))
+            
+            # Show relevance/match score if available
+            if score:
+                # Clamp so scores outside 0-1 still map to a valid bar
+                bars = _BARS[max(0, min(10, int(score * 10)))]
+                append(_PROPERTY_SCORE.format(bars, score))
+            
+            if desc:
+                append(_PROPERTY_DESCRIPTION.format(desc[:120]))
+            append("")
+        
+        # One print for the whole listing instead of one per line
+        print("\n".join(lines))
     else:
-        print(f"Results: {str(data)[:500]}...")
+        # No properties found, show raw data
+        print("No specific properties found. Raw response:")
+        print(preview_json(data) + "...")
 
 
 def demo_semantic_search():
     """Demonstrate AI-powered semantic property search."""
     
-    print("\n" + "="*70)
+    print("\n" + BAR)
     print("DEMO: AI-Powered Semantic Property Search")
-    print("="*70)
+    print(BAR)
     print("Using natural language understanding to find perfect matches")
     
     # Initialize registry with MCP tools
@@ -83,86 +144,41 @@ def demo_semantic_search():
     registry = ToolRegistry()
     mcp_tools = RealEstateMCPToolSet(server_url="http://localhost:8000/mcp")
     registry.register_tool_set(mcp_tools)
-    
     print(f"✅ Connected to MCP server with semantic search capabilities")
     
-    # Semantic search queries that test understanding
-    semantic_queries = [
-        {
-            "query": "I want a peaceful retreat with nature views where I can work from home and enjoy morning coffee on a deck",
-            "description": "Finding homes that match lifestyle preferences"
-        },
-        {
-            "query": "Something perfect for entertaining friends with an open floor plan and outdoor space for BBQs",
-            "description": "Social lifestyle and entertainment focus"
-        },
-        {
-            "query": "A cozy nest for a young professional near transit and coffee shops with modern amenities",
-            "description": "Urban convenience and modern living"
-        },
-        {
-            "query": "Family-friendly home with safe neighborhood, good schools, and space for kids to play",
-            "description": "Family needs and child-focused features"
-        },
-        {
-            "query": "Investment property with good rental potential in an up-and-coming neighborhood",
-            "description": "Investment focus and growth potential"
-        },
-        {
-            "query": "Eco-friendly home with solar panels, energy efficiency, and sustainable features",
-            "description": "Environmental consciousness and sustainability"
-        },
-        {
-            "query": "Historic charm with original details but updated kitchen and bathrooms",
-            "description": "Balance of character and modern updates"
-        },
-        {
-            "query": "Minimalist space with clean lines, lots of natural light, and low maintenance",
-            "description": "Aesthetic preferences and lifestyle simplicity"
-        }
-    ]
+    print(f"\n🎯 Testing {len(SEMANTIC_QUERIES)} semantic understanding scenarios...")
+    print(BAR)
     
-    print(f"\n🎯 Testing {len(semantic_queries)} semantic understanding scenarios...")
-    print("="*70)
+    # The searches are independent, so send them as one batch over the shared
+    # session and print the results in order once they are all back
+    tool_calls = [
+        _SEMANTIC_SEARCH_CALL.model_copy(update={
+            "arguments": {**_SEMANTIC_SEARCH_CALL.arguments, "query": item['query']}
+        })
+        for item in SEMANTIC_QUERIES
+    ]
+    results = registry.execute_tools(tool_calls)
     
-    for i, item in enumerate(semantic_queries, 1):
-        print(f"\n{'='*70}")
-        print(f"Scenario {i}: {item['description']}")
-        print(f"{'='*70}")
-        
-        # Execute semantic search
-        tool_call = ToolCall(
-            tool_name="natural_language_search_tool",
-            arguments={
-                "query": item['query'],
-                "search_type": "semantic",
-                "size": 3
-            }
-        )
-        
-        print(f"\n💭 Natural Language Query:")
-        print(f"   \"{item['query']}\"")
-        
-        result = registry.execute_tool(tool_call)
+    for i, (item, result) in enumerate(zip(SEMANTIC_QUERIES, results), 1):
+        sys.stdout.write(_SCENARIO_HEADER.format(i, item['description'], item['query']))
         
         if result.success:
             display_semantic_results(result.result, item['query'])
             print(f"⏱️ Search time: {result.execution_time:.3f}s")
         else:
             print(f"❌ Search failed: {result.error}")
+        sys.stdout.flush()
     
     # Comparison: Semantic vs Keyword Search
-    print(f"\n{'='*70}")
+    print(f"\n{BAR}")
     print("BONUS: Semantic vs Keyword Search Comparison")
-    print(f"{'='*70}")
+    print(BAR)
     
     comparison_query = "charming vintage home with character"
     
     print(f"\n🔍 Query: '{comparison_query}'")
-    print("-" * 40)
+    print(DASH)
     
-    # Keyword search
-    print("\n📝 Traditional Keyword Search:")
     keyword_call = ToolCall(
         tool_name="search_properties_tool",
         arguments={
@@ -171,14 +187,6 @@ def demo_semantic_search():
         }
     )
     
-    keyword_result = registry.execute_tool(keyword_call)
-    if keyword_result.success:
-        print("   Uses exact term matching")
-        print(f"   Results based on literal keywords: 'charming', 'vintage', 'character'")
-        print(f"   ⏱️ Time: {keyword_result.execution_time:.3f}s")
-    
-    # Semantic search
-    print("\n🤖 AI Semantic Search:")
     semantic_call = ToolCall(
         tool_name="natural_language_search_tool",
         arguments={
@@ -188,7 +196,17 @@ def demo_semantic_search():
         }
     )
     
-    semantic_result = registry.execute_tool(semantic_call)
+    keyword_result, semantic_result = registry.execute_tools([keyword_call, semantic_call])
+    
+    # Keyword search
+    print("\n📝 Traditional Keyword Search:")
+    if keyword_result.success:
+        print("   Uses exact term matching")
+        print(f"   Results based on literal keywords: 'charming', 'vintage', 'character'")
+        print(f"   ⏱️ Time: {keyword_result.execution_time:.3f}s")
+    
+    # Semantic search
+    print("\n🤖 AI Semantic Search:")
     if semantic_result.success:
         print("   Understands intent and context")
         print("   Finds homes with historic features, unique architecture, original details")
@@ -196,9 +214,9 @@ def demo_semantic_search():
         print(f"   ⏱️ Time: {semantic_result.execution_time:.3f}s")
     
     # Summary
-    print(f"\n{'='*70}")
+    print(f"\n{BAR}")
     print("DEMO SUMMARY")
-    print(f"{'='*70}")
+    print(BAR)
     print("✅ Demonstrated AI-powered semantic search capabilities")
     print("🤖 Natural language understanding interprets intent, not just keywords")
     print("🎯 Semantic matching finds properties based on lifestyle and preferences")
@@ -210,7 +228,8 @@ def demo_semantic_search():
 
 if __name__ == "__main__":
     try:
-        demo_semantic_search()
+        with buffered_stdout():
+            demo_semantic_search()
     except Exception as e:
         print(f"\n❌ Demo error: {e}")
         print("   Make sure the MCP server is running at http://localhost:8000/mcp")
@@ -164,7 +164,7 @@ def demo_tool_discovery():
                     status = info.get('status', 'unknown')
                     emoji = "✅" if status == "healthy" else "⚠️"
                     print(f"   {emoji} {service}: {info.get('message', 'No message')}")
-            except:
+            except json.JSONDecodeError:
                 print(f"   Result: {result.result}")
         else:
             print(f"   Result: {result.result}")
@@ -1,14 +1,19 @@
 """Centralized configuration for DSPy project."""
 import os
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class Config(BaseModel):
-    """Project configuration."""
-    model: str = os.getenv("LLM_MODEL", "openai/gpt-4o-mini")
-    temperature: float = float(os.getenv("LLM_TEMPERATURE", "0.7"))
-    max_tokens: int = int(os.getenv("LLM_MAX_TOKENS", "1024"))
-    max_iterations: int = int(os.getenv("AGENT_MAX_ITERATIONS", os.getenv("LLM_MAX_ITERATIONS", "10")))
+    """Project configuration, read from the environment once at import."""
+    model_config = ConfigDict(frozen=True)
+    
+    model: str = os.environ.get("LLM_MODEL", "openai/gpt-4o-mini")
+    temperature: float = float(os.environ.get("LLM_TEMPERATURE", "0.7"))
+    max_tokens: int = int(os.environ.get("LLM_MAX_TOKENS", "1024"))
+    # Reuse DSPy's exact-match response cache for repeated identical requests
+    cache: bool = os.environ.get("LLM_CACHE", "true").lower() == "true"
+    # AGENT_MAX_ITERATIONS wins; LLM_MAX_ITERATIONS is only read when it is unset
+    max_iterations: int = int(os.environ.get("AGENT_MAX_ITERATIONS") or os.environ.get("LLM_MAX_ITERATIONS") or "10")
 
 
-config = Config()
\ No newline at end of file
+config = Config()
@@ -6,13 +6,56 @@ and visually appealing. It includes phase markers, concept highlights,
 and structured logging for better understanding of the system's behavior.
 """
 
-from typing import Optional, List, Dict, Any
+from contextlib import contextmanager
+from typing import Iterator, Optional, List, Dict, Any
+import sys
+import textwrap
 import time
 from datetime import datetime
 
 
+@contextmanager
+def buffered_stdout() -> Iterator[None]:
+    """Turn off stdout line buffering for the duration of a demo.
+    
+    Terminals line-buffer stdout, so every printed line is its own write.
+    Demos print in bursts; inside this block they call sys.stdout.flush()
+    at natural boundaries (end of a scenario or query) instead, and the
+    stream is flushed and restored on exit.
+    """
+    stream = sys.stdout
+    reconfigure = getattr(stream, "reconfigure", None)
+    line_buffering = reconfigure is not None and getattr(stream, "line_buffering", False)
+    if line_buffering:
+        reconfigure(line_buffering=False)
+    try:
+        yield
+    finally:
+        stream.flush()
+        if line_buffering:
+            reconfigure(line_buffering=True)
+
+
+# Section separators, built once
+_SEP80 = "=" * 80
+_SEP70 = "=" * 70
+_SEP60 = "=" * 60
+
+
+def _preview(text: str, limit: int, tail: str = "...") -> str:
+    """Return text cut to `limit` characters, marked with `tail` when cut."""
+    return text if len(text) <= limit else text[:limit] + tail
+
+
+# Wraps final answers for display; reused across calls
+_ANSWER_WRAPPER = textwrap.TextWrapper(width=70, initial_indent="   ", subsequent_indent="   ")
+
+
 class DemoLogger:
-    """Rich logging for demo workflows with separate sections for each phase."""
+    """Rich logging for demo workflows with separate sections for each phase.
+    
+    Each block is assembled in full and written with a single sys.stdout.write.
+    """
     
     def __init__(self, demo_name: str, total_queries: int):
         self.demo_name = demo_name
@@ -24,107 +67,111 @@ class DemoLogger:
     def log_query_start(self, query: str, context_count: int):
         """Log the start of a query with context information."""
         self.query_number += 1
-        print(f"\n{'='*80}")
-        print(f"Turn {self.query_number}/{self.total_queries}")
-        print(f"{'='*80}")
-        print(f"🗨️  Query: {query}")
-        print(f"📚 Context: {context_count} previous interactions")
+        parts = [
+            f"\n{_SEP80}\n",
+            f"Turn {self.query_number}/{self.total_queries}\n",
+            f"{_SEP80}\n",
+            f"🗨️  Query: {query}\n",
+            f"📚 Context: {context_count} previous interactions\n",
+        ]
         if context_count > 0:
-            print("💭 This query can build on previous conversation context")
-        print()
+            parts.append("💭 This query can build on previous conversation context\n")
+        parts.append("\n")
+        sys.stdout.write("".join(parts))
     
     def log_react_start(self):
         """Log React loop start with clear section separator."""
-        print(f"{'='*80}")
-        print("Starting React loop")
-        print(f"{'='*80}")
         self.iteration_start = time.time()
         self.react_call_count = 0
+        sys.stdout.write(f"{_SEP80}\nStarting React loop\n{_SEP80}\n")
     
     def log_react_iteration(self, iteration: int, thought: str, tool_name: str, tool_args: Dict[str, Any], result: str):
         """Log individual React iteration results."""
         self.react_call_count += 1
-        print(f"react loop call {self.react_call_count} - log of results:")
-        print(f"  Thought: {thought}")
+        result_line = f"  Result: {_preview(result, 100)}\n"
         if tool_name:
-            print(f"  Tool: {tool_name}")
-            print(f"  Args: {tool_args}")
-            print(f"  Result: {result[:100]}{'...' if len(result) > 100 else ''}")
+            action = f"  Tool: {tool_name}\n  Args: {tool_args}\n"
         else:
-            print(f"  Action: Final Answer")
-            print(f"  Result: {result[:100]}{'...' if len(result) > 100 else ''}")
-        print()
+            action = "  Action: Final Answer\n"
+        sys.stdout.write(
+            f"react loop call {self.react_call_count} - log of results:\n"
+            f"  Thought: {thought}\n{action}{result_line}\n"
+        )
     
     def log_react_complete(self, result):
         """Log React loop completion with summary."""
         execution_time = time.time() - self.iteration_start
-        print(f"summary:")
-        print(f"✓ React loop completed in {execution_time:.1f}s")
-        print(f"  Total iterations: {result.iterations}")
         if result.tools_used:
-            print(f"  Tools used: {', '.join(result.tools_used)}")
+            tools = ', '.join(result.tools_used)
         else:
-            print("  Tools used: None (used context)")
-        print()
+            tools = "None (used context)"
+        sys.stdout.write(
+            "summary:\n"
+            f"✓ React loop completed in {execution_time:.1f}s\n"
+            f"  Total iterations: {result.iterations}\n"
+            f"  Tools used: {tools}\n\n"
+        )
     
     def log_extract_start(self):
         """Log Extract agent start with clear section separator."""
-        print(f"{'='*80}")
-        print("Extract Agent")
-        print(f"{'='*80}")
+        sys.stdout.write(f"{_SEP80}\nExtract Agent\n{_SEP80}\n")
         
     def log_extract_complete(self, answer: str):
         """Log Extract agent completion with final answer."""
-        print("log of call results:")
-        print("✓ Answer extracted and synthesized")
-        print()
-        print("🎯 Final Result:")
-        import textwrap
-        wrapped = textwrap.fill(answer, width=70,
-                               initial_indent="   ",
-                               subsequent_indent="   ")
-        print(wrapped)
-        print()
+        out = sys.stdout
+        out.write(
+            "log of call results:\n"
+            "✓ Answer extracted and synthesized\n\n"
+            "🎯 Final Result:\n"
+        )
+        # Stream the wrapped lines instead of joining them into one string first
+        out.writelines(f"{line}\n" for line in _ANSWER_WRAPPER.wrap(answer) or ("",))
+        out.write("\n")
     
     def log_conversation_stats(self, session):
         """Log conversation state and memory information."""
-        print(f"📊 Conversation Stats:")
-        print(f"  - Total interactions: {session.history.total_trajectories_processed}")
-        print(f"  - Active trajectories: {len(session.history.trajectories)}")
-        print(f"  - Memory summaries: {len(session.history.summaries)}")
+        history = session.history
+        summary_count = len(history.summaries)
         
         # Show memory management status
-        if len(session.history.summaries) > 0:
-            print(f"  - Memory window: Active (summaries created)")
+        if summary_count > 0:
+            window = "Active (summaries created)"
         else:
-            print(f"  - Memory window: All conversations retained")
-        print()
+            window = "All conversations retained"
+        sys.stdout.write(
+            "📊 Conversation Stats:\n"
+            f"  - Total interactions: {history.total_trajectories_processed}\n"
+            f"  - Active trajectories: {len(history.trajectories)}\n"
+            f"  - Memory summaries: {summary_count}\n"
+            f"  - Memory window: {window}\n\n"
+        )
     
     def log_demo_complete(self, session):
         """Log demo completion with comprehensive summary."""
         total_time = time.time() - self.start_time
+        history = session.history
         
-        print(f"{'='*80}")
-        print("📋 Final Demo Summary")
-        print(f"{'='*80}")
-        
-        print(f"\n🎯 {self.demo_name} Workflow Complete!")
-        print(f"⏱️  Total execution time: {total_time:.1f}s")
-        print(f"🗨️  Queries processed: {self.query_number}")
-        print(f"🧠 Memory state: {len(session.history.trajectories)} active, {len(session.history.summaries)} summarized")
-        
-        print(f"\n✅ Key Demonstrations:")
-        print(f"  ✓ Context building across multiple queries")
-        print(f"  ✓ Memory management and conversation continuity") 
-        print(f"  ✓ Tool usage with context awareness")
-        print(f"  ✓ Natural workflow progression")
+        parts = [
+            f"{_SEP80}\n",
+            "📋 Final Demo Summary\n",
+            f"{_SEP80}\n",
+            f"\n🎯 {self.demo_name} Workflow Complete!\n",
+            f"⏱️  Total execution time: {total_time:.1f}s\n",
+            f"🗨️  Queries processed: {self.query_number}\n",
+            f"🧠 Memory state: {len(history.trajectories)} active, {len(history.summaries)} summarized\n",
+            "\n✅ Key Demonstrations:\n",
+            "  ✓ Context building across multiple queries\n",
+            "  ✓ Memory management and conversation continuity\n",
+            "  ✓ Tool usage with context awareness\n",
+            "  ✓ Natural workflow progression\n",
+        ]
         
         # Show conversation flow summary
-        if len(session.history.trajectories) > 1:
-            print(f"\n📜 Conversation Flow:")
-            for i, traj in enumerate(session.history.trajectories, 1):
-                query_preview = traj.user_query[:60] + "..." if len(traj.user_query) > 60 else traj.user_query
-                print(f"  {i}. {query_preview}")
+        if len(history.trajectories) > 1:
+            parts.append("\n📜 Conversation Flow:\n")
+            for i, traj in enumerate(history.trajectories, 1):
+                parts.append(f"  {i}. {_preview(traj.user_query, 60)}\n")
+        sys.stdout.write("".join(parts))
 
 
 # Legacy static methods for backwards compatibility
@@ -180,7 +227,7 @@ def visualize_conversation_flow(
         max_display: Maximum number of trajectories to display
     """
     print("\n📊 Conversation Flow Visualization:")
-    print("="*60)
+    print(_SEP60)
     
     # Show summaries if present
     if summaries:
@@ -195,36 +242,33 @@ def visualize_conversation_flow(
     print("🔄 Active Trajectories:")
     display_trajectories = trajectories[-max_display:] if len(trajectories) > max_display else trajectories
     
+    last_index = len(display_trajectories) - 1
     for i, traj in enumerate(display_trajectories):
-        is_last = (i == len(display_trajectories) - 1)
-        marker = "└──" if is_last else "├──"
+        is_last = (i == last_index)
+        marker, indent = ("└──", "    ") if is_last else ("├──", "│   ")
         
         # Get query preview
-        query = traj.user_query if hasattr(traj, 'user_query') else "Unknown query"
-        query_preview = query[:40] + "..." if len(query) > 40 else query
-        
-        print(f"{marker} [{i+1}] {query_preview}")
+        query = getattr(traj, 'user_query', "Unknown query")
+        print(f"{marker} [{i+1}] {_preview(query, 40)}")
         
         # Show tools used if available
-        if hasattr(traj, 'tools_used') and traj.tools_used:
-            tools = traj.tools_used[:3]
-            tools_str = ', '.join(tools)
-            if len(traj.tools_used) > 3:
-                tools_str += f" (+{len(traj.tools_used)-3} more)"
+        tools_used = getattr(traj, 'tools_used', None)
+        if tools_used:
+            tools_str = ', '.join(tools_used[:3])
+            if len(tools_used) > 3:
+                tools_str += f" (+{len(tools_used)-3} more)"
             
-            indent = "    " if is_last else "│   "
             print(f"{indent} Tools: {tools_str}")
         
         # Show metadata if available
-        if hasattr(traj, 'metadata') and traj.metadata:
-            indent = "    " if is_last else "│   "
-            if 'conversation_turn' in traj.metadata:
-                print(f"{indent} Turn: #{traj.metadata['conversation_turn']}")
+        metadata = getattr(traj, 'metadata', None)
+        if metadata and 'conversation_turn' in metadata:
+            print(f"{indent} Turn: #{metadata['conversation_turn']}")
     
     if len(trajectories) > max_display:
         print(f"\n  ... and {len(trajectories) - max_display} more trajectories")
     
-    print("="*60)
+    print(_SEP60)
 
 
 def show_context_influence(
@@ -302,12 +346,12 @@ def highlight_summary_creation(
         tools_preserved: Tools mentioned in the summary
     """
     print("\n🎯 SUMMARY CREATION EVENT")
-    print("="*60)
+    print(_SEP60)
     print(f"📝 Summarizing {trajectories_removed} trajectories:")
-    print(f"   Summary: {summary_text[:150]}..." if len(summary_text) > 150 else f"   Summary: {summary_text}")
+    print(f"   Summary: {_preview(summary_text, 150)}")
     if tools_preserved:
         print(f"   Preserved Tools: {', '.join(tools_preserved)}")
-    print("="*60)
+    print(_SEP60)
     print()
 
 
@@ -340,9 +384,9 @@ class DemoScenario:
     
     def introduce(self) -> None:
         """Introduce the scenario to the user."""
-        print(f"\n{'='*70}")
+        print(f"\n{_SEP70}")
         print(f"📚 SCENARIO: {self.name}")
-        print(f"{'='*70}")
+        print(_SEP70)
         print(f"\n📝 Description: {self.description}")
         
         print("\n🎯 Concepts Demonstrated:")
@@ -357,5 +401,5 @@ class DemoScenario:
         for i, query in enumerate(self.queries, 1):
             print(f"  {i}. {query}")
         
-        print(f"\n{'='*70}\n")
+        print(f"\n{_SEP70}\n")
         time.sleep(1)  # Pause for reading
\ No newline at end of file
@@ -27,6 +27,7 @@ def setup_llm(model: Optional[str] = None, **kwargs) -> dspy.LM:
     llm_config = {
         "temperature": config.temperature,
         "max_tokens": config.max_tokens,
+        "cache": config.cache,
         **kwargs
     }
     llm = dspy.LM(model=model, **llm_config)
@@ -5,12 +5,21 @@ This module implements a flat message list structure inspired by AWS Strands SDK
 replacing the nested trajectory-based system with a simpler, more maintainable approach.
 """
 
-from typing import List, Optional, Dict, Any, Literal
-from pydantic import BaseModel, Field, ConfigDict
+import time
+from collections import deque
+from copy import deepcopy
+from itertools import islice
+from typing import Deque, Iterator, List, Optional, Dict, Any, Literal, Tuple
+from pydantic import BaseModel, Field, ConfigDict, PrivateAttr
 from datetime import datetime
 from enum import Enum
 
 
+# Number of key points kept in a summary of trimmed messages
+SUMMARY_KEY_POINTS = 3
+_KEY_POINT_PREFIXES = {"user": "User asked", "assistant": "Assistant"}
+
+
 class ToolStatus(str, Enum):
     """Status of a tool execution."""
     SUCCESS = "success"
@@ -72,25 +81,74 @@ class MessageList(BaseModel):
     
     # Private counter for tool use IDs
     _tool_use_counter: int = 0
+    # Running aggregates, updated as trajectories are added (see _record)
+    _tools_used: Dict[str, None] = PrivateAttr(default_factory=dict)
+    _total_execution_time_ms: float = 0.0
+    _iteration_count: int = 0
+    # Whether the latest assistant message has selected 'finish'
+    _finished: bool = False
+    _last_observation: Optional[ToolResult] = None
+    # Rendered to_llm_format lines, and the thoughts numbered so far
+    _llm_lines: List[str] = PrivateAttr(default_factory=list)
+    _thought_count: int = 0
+    
+    def model_post_init(self, __context: Any) -> None:
+        """Seed the running aggregates from messages passed at construction."""
+        for message in self.messages:
+            self._record_message(message)
+    
+    def model_copy(self, *, update: Optional[Dict[str, Any]] = None, deep: bool = False) -> "MessageList":
+        """
+        Copy the message list, rebuilding the running aggregates for the copy.
+        
+        The copy always gets its own messages list, since messages are appended
+        to it in place; the messages themselves are shared unless deep is set.
+        """
+        fields = dict(self) | (update or {})
+        if deep:
+            fields = deepcopy(fields)
+        copied = MessageList(**fields)
+        copied._tool_use_counter = self._tool_use_counter
+        return copied
+    
+    def _append_message(self, message: Message) -> None:
+        """Append a message and fold it into the running aggregates."""
+        self.messages.append(message)
+        self._record_message(message)
+    
+    def _record_message(self, message: Message) -> None:
+        """Fold every trajectory of a newly added message into the aggregates."""
+        if message.role == "assistant":
+            self._finished = False
+        for trajectory in message.trajectories:
+            self._record(message.role, trajectory)
+    
+    def _record(self, role: str, trajectory: Trajectory) -> None:
+        """Fold a newly added trajectory into the running aggregates."""
+        tool_use = trajectory.tool_use
+        if role == "assistant" and tool_use:
+            # Each tool call is an iteration; 'finish' counts too and ends the message
+            if not self._finished:
+                self._iteration_count += 1
+            if tool_use.tool_name == "finish":
+                self._finished = True
+            else:
+                self._tools_used.setdefault(tool_use.tool_name, None)
+        if trajectory.tool_result:
+            self._total_execution_time_ms += trajectory.tool_result.execution_time_ms
+            self._last_observation = trajectory.tool_result
+        self._render(role, trajectory)
     
     def _generate_tool_use_id(self) -> str:
         """Generate a unique tool use ID."""
         self._tool_use_counter += 1
-        return f"tool_{self._tool_use_counter}_{datetime.now().timestamp()}"
+        # A monotonic clock read is cheaper than building a datetime
+        return f"tool_{self._tool_use_counter}_{time.monotonic_ns()}"
     
     @property
     def iteration_count(self) -> int:
         """Count iterations based on assistant messages with tool calls."""
-        count = 0
-        for message in self.messages:
-            if message.role == "assistant":
-                for trajectory in message.trajectories:
-                    if trajectory.tool_use and trajectory.tool_use.tool_name != "finish":
-                        count += 1
-                    elif trajectory.tool_use and trajectory.tool_use.tool_name == "finish":
-                        count += 1  # Count finish as an iteration
-                        break
-        return count
+        return self._iteration_count
     
     @property
     def is_complete(self) -> bool:
@@ -100,49 +158,24 @@ class MessageList(BaseModel):
         """
         if not self.messages:
             return False
-            
-        # Check for finish tool in last assistant message
-        for message in reversed(self.messages):
-            if message.role == "assistant":
-                for trajectory in message.trajectories:
-                    if trajectory.tool_use and trajectory.tool_use.tool_name == "finish":
-                        return True
-                break
         
-        # Check if max iterations reached
-        return self.iteration_count >= self.max_iterations
+        # Finish tool selected in last assistant message, or max iterations reached
+        return self._finished or self._iteration_count >= self.max_iterations
     
     @property
     def tools_used(self) -> List[str]:
         """Get list of unique tools used (excluding 'finish')."""
-        tools = []
-        for message in self.messages:
-            if message.role == "assistant":
-                for trajectory in message.trajectories:
-                    if trajectory.tool_use:
-                        tool_name = trajectory.tool_use.tool_name
-                        if tool_name != "finish" and tool_name not in tools:
-                            tools.append(tool_name)
-        return tools
+        return list(self._tools_used)
     
     @property
     def last_observation(self) -> Optional[ToolResult]:
         """Get the most recent tool result."""
-        for message in reversed(self.messages):
-            for trajectory in reversed(message.trajectories):
-                if trajectory.tool_result:
-                    return trajectory.tool_result
-        return None
+        return self._last_observation
     
     @property
     def total_execution_time_ms(self) -> float:
         """Calculate total execution time across all tools."""
-        total = 0.0
-        for message in self.messages:
-            for trajectory in message.trajectories:
-                if trajectory.tool_result:
-                    total += trajectory.tool_result.execution_time_ms
-        return total
+        return self._total_execution_time_ms
     
     def add_assistant_message(
         self,
@@ -177,7 +210,7 @@ class MessageList(BaseModel):
             role="assistant",
             trajectories=trajectories
         )
-        self.messages.append(message)
+        self._append_message(message)
         
         return tool_use_id
     
@@ -191,34 +224,30 @@ class MessageList(BaseModel):
         execution_time_ms: float = 0
     ) -> None:
         """Add a tool result to the message list."""
+        trajectory = Trajectory(
+            tool_result=ToolResult(
+                tool_use_id=tool_use_id,
+                status=status,
+                result=result,
+                error=error,
+                execution_time_ms=execution_time_ms
+            )
+        )
+        
         # Add as a new trajectory in the last assistant message
         # or create a new assistant message if needed
         if self.messages and self.messages[-1].role == "assistant":
-            # Add to existing assistant message
-            self.messages[-1].trajectories.append(Trajectory(
-                tool_result=ToolResult(
-                    tool_use_id=tool_use_id,
-                    status=status,
-                    result=result,
-                    error=error,
-                    execution_time_ms=execution_time_ms
-                )
-            ))
+            # Replace the last message rather than extending it in place, so
+            # copies and histories holding it are not changed behind their aggregates
+            last = self.messages[-1]
+            self.messages[-1] = last.model_copy(update={"trajectories": [*last.trajectories, trajectory]})
+            self._record("assistant", trajectory)
         else:
             # Create new assistant message with tool result
-            message = Message(
+            self._append_message(Message(
                 role="assistant",
-                trajectories=[Trajectory(
-                    tool_result=ToolResult(
-                        tool_use_id=tool_use_id,
-                        status=status,
-                        result=result,
-                        error=error,
-                        execution_time_ms=execution_time_ms
-                    )
-                )]
-            )
-            self.messages.append(message)
+                trajectories=[trajectory]
+            ))
     
     def add_user_message(self, text: str) -> None:
         """Add a user message."""
@@ -226,44 +255,42 @@ class MessageList(BaseModel):
             role="user",
             trajectories=[Trajectory(text=text)]
         )
-        self.messages.append(message)
+        self._append_message(message)
     
     def to_llm_format(self) -> str:
         """Format messages for LLM consumption."""
-        lines = [f"User Query: {self.user_query}\n"]
+        # Lines are rendered once as trajectories are added (see _render)
+        return "\n".join([f"User Query: {self.user_query}\n", *self._llm_lines])
+    
+    def _render(self, role: str, trajectory: Trajectory) -> None:
+        """Append the to_llm_format lines of a newly added trajectory."""
+        lines = self._llm_lines
+        if role == "user":
+            # User messages
+            if trajectory.text:
+                lines.append(f"User: {trajectory.text}")
         
-        iteration = 0
-        for message in self.messages:
-            if message.role == "user":
-                # User messages
-                for trajectory in message.trajectories:
-                    if trajectory.text:
-                        lines.append(f"User: {trajectory.text}")
+        elif role == "assistant":
+            # Assistant messages with iterations
+            if trajectory.thought:
+                self._thought_count += 1
+                lines.append(f"Iteration {self._thought_count}:")
+                lines.append(f"  Thought: {trajectory.thought}")
             
-            elif message.role == "assistant":
-                # Assistant messages with iterations
-                for trajectory in message.trajectories:
-                    if trajectory.thought:
-                        iteration += 1
-                        lines.append(f"Iteration {iteration}:")
-                        lines.append(f"  Thought: {trajectory.thought}")
-                    
-                    if trajectory.tool_use:
-                        lines.append(f"  Tool: {trajectory.tool_use.tool_name}")
-                        if trajectory.tool_use.tool_args:
-                            lines.append(f"  Args: {trajectory.tool_use.tool_args}")
-                        
-                        # Special handling for finish tool
-                        if trajectory.tool_use.tool_name == "finish":
-                            lines.append("  Status: Task complete, ready for answer extraction")
-                    
-                    if trajectory.tool_result:
-                        if trajectory.tool_result.status == ToolStatus.SUCCESS:
-                            lines.append(f"  Result: {trajectory.tool_result.result}")
-                        else:
-                            lines.append(f"  Error: {trajectory.tool_result.error}")
-        
-        return "\n".join(lines)
+            if trajectory.tool_use:
+                lines.append(f"  Tool: {trajectory.tool_use.tool_name}")
+                if trajectory.tool_use.tool_args:
+                    lines.append(f"  Args: {trajectory.tool_use.tool_args}")
+                
+                # Special handling for finish tool
+                if trajectory.tool_use.tool_name == "finish":
+                    lines.append("  Status: Task complete, ready for answer extraction")
+            
+            if trajectory.tool_result:
+                if trajectory.tool_result.status == ToolStatus.SUCCESS:
+                    lines.append(f"  Result: {trajectory.tool_result.result}")
+                else:
+                    lines.append(f"  Error: {trajectory.tool_result.error}")
 
 
 class ExtractResult(BaseModel):
@@ -274,6 +301,22 @@ class ExtractResult(BaseModel):
     reasoning: str = Field(default="", description="The reasoning process used")
 
 
+def _message_context_lines(message: Message) -> Tuple[str, ...]:
+    """Render the context prompt lines for one message."""
+    lines = []
+    if message.role == "user":
+        for traj in message.trajectories:
+            if traj.text:
+                lines.append(f"User: {traj.text}")
+    elif message.role == "assistant":
+        for traj in message.trajectories:
+            if traj.text:
+                lines.append(f"Assistant: {traj.text}")
+            elif traj.thought:
+                lines.append(f"Assistant thought: {traj.thought}")
+    return tuple(lines)
+
+
 class ConversationHistory:
     """
     Conversation history manager using flat message list.
@@ -281,8 +324,13 @@ class ConversationHistory:
     
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         """Initialize with optional configuration."""
-        self.messages: List[Message] = []
+        # Deque so trimming the oldest messages does not copy the rest
+        self.messages: Deque[Message] = deque()
+        # Context prompt lines of each message, rendered once when it is added
+        self._context_lines: Deque[Tuple[str, ...]] = deque()
         self.summaries: List[str] = []
+        # Last prompt built from this history; reset by add_messages() and clear_history()
+        self._context_prompt: Optional[str] = None
         self.config = config or {}
         self.max_messages = self.config.get('max_messages', 100)
         self.summarize_removed = self.config.get('summarize_removed', True)
@@ -290,46 +338,38 @@ class ConversationHistory:
     def add_messages(self, message_list: MessageList) -> None:
         """Add messages from a MessageList to history."""
         self.messages.extend(message_list.messages)
+        self._context_lines.extend(map(_message_context_lines, message_list.messages))
+        self._context_prompt = None
         self._apply_sliding_window()
     
     def clear_history(self) -> None:
         """Clear all conversation history."""
-        self.messages = []
+        self.messages = deque()
+        self._context_lines = deque()
         self.summaries = []
+        self._context_prompt = None
     
-    def get_context_for_agent(self) -> Dict[str, Any]:
-        """Get context for the agent from message history."""
-        return {
-            "message_count": len(self.messages),
-            "messages": self.messages,
-            "summaries": self.summaries
-        }
-    
-    def build_context_prompt(self, context: Dict[str, Any]) -> str:
+    def build_context_prompt(self) -> str:
         """Build context prompt from message history."""
-        if not context["messages"] and not context["summaries"]:
+        if not self.messages and not self.summaries:
             return ""
         
-        lines = ["Previous conversation context:"]
+        # Rebuilt only after add_messages() or clear_history() changed the history
+        if self._context_prompt is None:
+            self._context_prompt = "\n".join(self._iter_context_lines())
+        return self._context_prompt
+    
+    def _iter_context_lines(self) -> Iterator[str]:
+        """Yield the lines of the context prompt, streamed straight into the join."""
+        yield "Previous conversation context:"
         
         # Add summaries if any
-        for summary in context.get("summaries", []):
-            lines.append(f"[Summary]: {summary}")
-        
-        # Add recent messages
-        for message in context.get("messages", []):
-            if message.role == "user":
-                for traj in message.trajectories:
-                    if traj.text:
-                        lines.append(f"User: {traj.text}")
-            elif message.role == "assistant":
-                for traj in message.trajectories:
-                    if traj.text:
-                        lines.append(f"Assistant: {traj.text}")
-                    elif traj.thought:
-                        lines.append(f"Assistant thought: {traj.thought}")
+        for summary in self.summaries:
+            yield f"[Summary]: {summary}"
         
-        return "\n".join(lines)
+        # Add recent messages, reusing the lines rendered when they were added
+        for lines in self._context_lines:
+            yield from lines
     
     def _apply_sliding_window(self) -> None:
         """Apply sliding window to message list."""
@@ -340,24 +380,22 @@ class ConversationHistory:
         trim_index = len(self.messages) - self.max_messages
         trim_index = self._find_safe_trim_point(trim_index)
         
-        # Optionally summarize removed messages
-        if self.summarize_removed and trim_index > 0:
-            removed = self.messages[:trim_index]
+        # Trim messages, optionally summarizing the removed ones
+        popleft = self.messages.popleft
+        removed = [popleft() for _ in range(trim_index)]
+        for _ in range(trim_index):
+            self._context_lines.popleft()
+        if self.summarize_removed and removed:
             summary = self._create_summary(removed)
             if summary:
                 self.summaries.append(summary)
-        
-        # Trim messages
-        self.messages = self.messages[trim_index:]
     
     def _find_safe_trim_point(self, target_index: int) -> int:
         """Find a safe point to trim without breaking tool pairs."""
         pending_tools = set()
         
         # Scan forward to find complete tool pairs
-        for i in range(target_index, len(self.messages)):
-            message = self.messages[i]
-            
+        for i, message in enumerate(islice(self.messages, target_index, None), target_index):
             for trajectory in message.trajectories:
                 if trajectory.tool_use:
                     pending_tools.add(trajectory.tool_use.tool_use_id)
@@ -372,18 +410,21 @@ class ConversationHistory:
     
     def _create_summary(self, messages: List[Message]) -> str:
         """Create a simple text summary of removed messages."""
-        # Simple implementation - can be enhanced with LLM summarization
-        key_points = []
-        for message in messages:
-            if message.role == "user":
-                for traj in message.trajectories:
-                    if traj.text:
-                        key_points.append(f"User asked: {traj.text[:50]}...")
-            elif message.role == "assistant":
-                for traj in message.trajectories:
-                    if traj.text:
-                        key_points.append(f"Assistant: {traj.text[:50]}...")
+        # Simple implementation - can be enhanced with LLM summarization.
+        # Only the first few key points are kept, so stop scanning once found.
+        key_points = list(islice(self._iter_key_points(messages), SUMMARY_KEY_POINTS))
         
         if key_points:
-            return "Earlier conversation: " + "; ".join(key_points[:3])
-        return ""
\ No newline at end of file
+            return "Earlier conversation: " + "; ".join(key_points)
+        return ""
+    
+    @staticmethod
+    def _iter_key_points(messages: List[Message]) -> Iterator[str]:
+        """Yield a short key point for each text block, oldest first."""
+        for message in messages:
+            prefix = _KEY_POINT_PREFIXES.get(message.role)
+            if prefix is None:
+                continue
+            for traj in message.trajectories:
+                if traj.text:
+                    yield f"{prefix}: {traj.text[:50]}..."
@@ -157,11 +157,27 @@ class BaseTool(BaseModel, ABC):
         Validates the input arguments using the tool's 'args_model'
         and then executes the tool's logic.
         
+        Returns:
+            The result of the tool's operation.
+        """
+        execution_args = self.validate_arguments(**kwargs)
+            
+        # Execute the tool with the validated arguments  
+        # Only log number of args at INFO level for security
+        logger.info(f"Tool '{self.name}': Executing with {len(execution_args)} arguments")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Tool '{self.name}': Execution args: {execution_args}")
+        return self.execute(**execution_args)
+    
+    def validate_arguments(self, **kwargs) -> Dict[str, Any]:
+        """
+        Validates the input arguments using the tool's 'args_model'.
+        
         Session is passed through without validation if present,
         as it's not part of the args_model.
         
         Returns:
-            The result of the tool's operation.
+            The validated arguments, ready to pass to execute().
         """
         # Extract session before validation (not part of args_model)
         session = kwargs.pop('session', None)
@@ -191,12 +207,7 @@ class BaseTool(BaseModel, ABC):
         if self._accepts_session and session is not None:
             execution_args['session'] = session
             logger.info(f"Tool '{self.name}': Added session to execution args")
-            
-        # Execute the tool with the validated arguments  
-        # Only log number of args at INFO level for security
-        logger.info(f"Tool '{self.name}': Executing with {len(execution_args)} arguments")
-        logger.debug(f"Tool '{self.name}': Execution args: {execution_args}")
-        return self.execute(**execution_args)
+        return execution_args
 
 
 class ToolTestCase(BaseModel):
@@ -5,12 +5,17 @@ This module defines the core infrastructure for organizing tools into logical gr
 Each tool set can contain multiple tools and provides a way to manage and load
 collections of tools relevant to specific domains or functionalities.
 """
-from typing import List, Optional, Dict, Type, ClassVar, Any
+from typing import List, Optional, Dict, Type, ClassVar, Any, TYPE_CHECKING
 from pydantic import BaseModel, Field, ConfigDict, PrivateAttr
 import dspy
 
+from ..models import ToolCall, ToolExecutionResult
 from .base_tool import ToolTestCase, BaseTool
 
+# Avoid circular imports
+if TYPE_CHECKING:
+    from .registry import ToolRegistry
+
 
 class ToolSetTestCase(ToolTestCase):
     """
@@ -140,4 +145,22 @@ class ToolSet(BaseModel):
         Returns:
             List[BaseTool]: List of tool instances, empty for class-based tool sets
         """
-        return []
\ No newline at end of file
+        return []
+    
+    def execute_batch(self, registry: "ToolRegistry", tool_calls: List[ToolCall]) -> List[ToolExecutionResult]:
+        """
+        Execute several tool calls together.
+        
+        The registry hands every batch to its tool set. By default the calls run
+        one after another through registry.execute_tool; tool sets backed by a
+        remote server (like MCP) can override this to share one round-trip.
+        Implementations must return one result per call, in the same order.
+        
+        Args:
+            registry: The registry the tool set is registered with
+            tool_calls: The tool calls to execute
+            
+        Returns:
+            List[ToolExecutionResult]: Results in the same order as tool_calls
+        """
+        return [registry.execute_tool(tool_call) for tool_call in tool_calls]
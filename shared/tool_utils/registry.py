@@ -26,11 +26,20 @@ class ToolRegistry:
     Updated for agentic loop integration to return ToolExecutionResult objects.
     """
     
-    def __init__(self):
-        """Initializes the ToolRegistry with empty dictionaries for tools and instances."""
+    def __init__(self, tool_set: Optional[ToolSet] = None):
+        """
+        Initializes the ToolRegistry with empty dictionaries for tools and instances.
+        
+        Args:
+            tool_set: Optional tool set to register right away, for the common
+                case of a registry serving a single tool set
+        """
         self._tools: Dict[str, Type[BaseTool]] = {}  # Stores tool classes, keyed by tool name
         self._instances: Dict[str, BaseTool] = {}  # Stores instantiated tool objects, keyed by tool name
         self._tool_set: Optional[ToolSet] = None  # Stores the current tool set if loaded
+        
+        if tool_set is not None:
+            self.register_tool_set(tool_set)
     
     def get_tool(self, name: str) -> Optional[BaseTool]:
         """
@@ -108,6 +117,24 @@ class ToolRegistry:
                 parameters=tool_call.arguments
             )
     
+    def execute_tools(self, tool_calls: List[ToolCall]) -> List[ToolExecutionResult]:
+        """
+        Executes several tool calls as one batch of the registered tool set.
+
+        The tool set receives all calls at once, so tool sets backed by a server
+        (e.g. MCP) can share a single round-trip; by default the calls run one
+        after another through execute_tool.
+
+        Args:
+            tool_calls (List[ToolCall]): The tool calls to execute.
+
+        Returns:
+            List[ToolExecutionResult]: Results in the same order as tool_calls.
+        """
+        if self._tool_set:
+            return self._tool_set.execute_batch(self, tool_calls)
+        return [self.execute_tool(tool_call) for tool_call in tool_calls]
+    
     def execute_tool_with_session(
         self,
         tool_name: str,
@@ -128,12 +155,13 @@ class ToolRegistry:
         Returns:
             The result of the tool execution
         """
-        # Truncate args for security in logs
-        args_str = str(kwargs)
-        if len(args_str) > 500:
-            args_str = args_str[:500] + "... (truncated)"
         logger.info(f"Registry: Executing tool '{tool_name}' with {len(kwargs)} arguments")
-        logger.debug(f"Registry: Tool arguments: {args_str}")
+        if logger.isEnabledFor(logging.DEBUG):
+            # Truncate args for security in logs
+            args_str = str(kwargs)
+            if len(args_str) > 500:
+                args_str = args_str[:500] + "... (truncated)"
+            logger.debug(f"Registry: Tool arguments: {args_str}")
         
         tool = self.get_tool(tool_name)
         if not tool:
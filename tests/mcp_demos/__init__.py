@@ -0,0 +1 @@
+# MCP demo tests package
\ No newline at end of file
@@ -0,0 +1,34 @@
+"""Test price ceiling extraction in the property search demo."""
+
+import pytest
+from mcp_demos.demo_property_search import parse_max_price
+
+
+class TestParseMaxPrice:
+    """Test parse_max_price on price and non-price phrases."""
+    
+    @pytest.mark.parametrize("query, expected", [
+        ("modern family home in Oakland, ideally under $900k", 900_000),
+        ("homes under 1.2 million", 1_200_000),
+        ("condos below 750,000", 750_000),
+        ("townhouse < $750,000", 750_000),
+        ("cottage < 800k", 800_000),
+        ("studio under $500", 500),
+        ("under 2 miles from BART and under $1m", 1_000_000),
+    ])
+    def test_price_phrases(self, query, expected):
+        """Test that real price ceilings are extracted as integers."""
+        max_price = parse_max_price(query)
+        assert max_price == expected
+        assert isinstance(max_price, int)
+    
+    @pytest.mark.parametrize("query", [
+        "3 bed homes under 20 minutes from downtown",
+        "houses under 10 years old",
+        "condo < 2 miles from BART",
+        "homes < 900000",
+        "family home with a pool in Oakland",
+    ])
+    def test_non_price_phrases(self, query):
+        """Test that distances, ages and bare small numbers set no ceiling."""
+        assert parse_max_price(query) is None
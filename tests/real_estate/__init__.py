@@ -0,0 +1 @@
+# Real estate tool tests package
@@ -0,0 +1,101 @@
+"""Test the Wikipedia lookup cache."""
+
+from typing import List
+
+from shared.models import ToolCall, ToolExecutionResult
+from tools.real_estate import lookup_cache
+from tools.real_estate.lookup_cache import LookupCache
+
+
+def wiki_call(city: str) -> ToolCall:
+    """A cacheable Wikipedia lookup for a city."""
+    return ToolCall(tool_name="search_wikipedia_by_location_tool", arguments={"city": city, "state": "CA"})
+
+
+def result_for(call: ToolCall, success: bool = True) -> ToolExecutionResult:
+    """A result echoing the call's city."""
+    return ToolExecutionResult(tool_name=call.tool_name, success=success, result=call.arguments.get("city"))
+
+
+class RecordingExecutor:
+    """Executes tool calls by echoing them, recording every batch it receives."""
+    
+    def __init__(self):
+        self.batches: List[List[ToolCall]] = []
+    
+    def __call__(self, calls: List[ToolCall]) -> List[ToolExecutionResult]:
+        self.batches.append(calls)
+        return [result_for(call) for call in calls]
+
+
+class TestLookupCache:
+    """Test expiry, eviction, persistence and batching of LookupCache."""
+    
+    def test_ttl_expiry(self, monkeypatch):
+        """Test that results are served until the TTL passes, then dropped."""
+        now = [1000.0]
+        monkeypatch.setattr(lookup_cache.time, "time", lambda: now[0])
+        cache = LookupCache(ttl=60)
+        call = wiki_call("Oakland")
+        cache.put(call, result_for(call))
+        
+        now[0] += 60
+        assert cache.get(call).result == "Oakland"
+        now[0] += 1
+        assert cache.get(call) is None
+    
+    def test_lru_eviction_order(self):
+        """Test that the least recently used result is evicted first."""
+        cache = LookupCache(maxsize=2)
+        oakland, berkeley, alameda = wiki_call("Oakland"), wiki_call("Berkeley"), wiki_call("Alameda")
+        cache.put(oakland, result_for(oakland))
+        cache.put(berkeley, result_for(berkeley))
+        
+        # Reading Oakland makes Berkeley the least recently used
+        assert cache.get(oakland) is not None
+        cache.put(alameda, result_for(alameda))
+        
+        assert cache.get(berkeley) is None
+        assert cache.get(oakland) is not None
+        assert cache.get(alameda) is not None
+    
+    def test_persistence_round_trip(self, tmp_path):
+        """Test that a closed shelve file serves results to a new cache."""
+        path = str(tmp_path / "lookups")
+        call = wiki_call("Oakland")
+        
+        cache = LookupCache(path=path)
+        cache.put(call, result_for(call))
+        cache.close()
+        
+        reopened = LookupCache(path=path)
+        try:
+            assert reopened.get(call) == result_for(call)
+        finally:
+            reopened.close()
+    
+    def test_only_successful_wikipedia_results(self):
+        """Test that failed results and other tools are never cached."""
+        cache = LookupCache()
+        failed = wiki_call("Oakland")
+        other = ToolCall(tool_name="search_properties_tool", arguments={"query": "pool"})
+        cache.put(failed, result_for(failed, success=False))
+        cache.put(other, ToolExecutionResult(tool_name=other.tool_name, result="homes"))
+        
+        assert cache.get(failed) is None
+        assert cache.get(other) is None
+    
+    def test_execute_batch_sends_only_misses(self):
+        """Test that cached calls are answered locally and misses go out as one batch."""
+        cache = LookupCache()
+        cached = wiki_call("Oakland")
+        cache.put(cached, result_for(cached))
+        executor = RecordingExecutor()
+        calls = [wiki_call("Berkeley"), cached, ToolCall(tool_name="search_properties_tool", arguments={})]
+        
+        results = cache.execute_batch(executor, calls)
+        
+        assert [result.result for result in results] == ["Berkeley", "Oakland", None]
+        assert executor.batches == [[calls[0], calls[2]]]
+        assert cache.execute(executor, calls[0]).result == "Berkeley"
+        assert len(executor.batches) == 1
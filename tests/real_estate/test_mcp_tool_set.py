@@ -0,0 +1,84 @@
+"""Test batched execution of MCP tool calls."""
+
+from typing import List
+
+from shared.models import ToolCall, ToolExecutionResult
+from shared.tool_utils.registry import ToolRegistry
+from tools.real_estate.mcp_client import MCPClient, MCPToolInfo
+from tools.real_estate.mcp_proxy import MCPToolProxy
+from tools.real_estate.mcp_tool_set import RealEstateMCPToolSet
+
+
+SEARCH_TOOL = MCPToolInfo(
+    name="search_properties_tool",
+    description="Search properties",
+    input_schema={
+        "properties": {
+            "query": {"type": "string"},
+            "size": {"type": "integer"},
+            "max_price": {"type": "number"}
+        },
+        "required": ["query"]
+    }
+)
+BROKEN_TOOL = MCPToolInfo(
+    name="broken_tool",
+    description="Fails with an error that is not a validation error",
+    input_schema={"properties": {"query": {"type": "string"}}, "required": ["query"]}
+)
+
+
+class RecordingMCPClient(MCPClient):
+    """MCP client that serves a fixed tool list and records the batches it receives."""
+    
+    batches: List[List[ToolCall]] = []
+    
+    async def discover_tools(self) -> List[MCPToolInfo]:
+        return [SEARCH_TOOL, BROKEN_TOOL]
+    
+    def call_tools(self, tool_calls: List[ToolCall]) -> List[ToolExecutionResult]:
+        self.batches.append(tool_calls)
+        return [
+            ToolExecutionResult(tool_name=call.tool_name, result=f"ok:{call.arguments['query']}", parameters=call.arguments)
+            for call in tool_calls
+        ]
+
+
+class TestExecuteBatch:
+    """Test RealEstateMCPToolSet.execute_batch with mixed valid and invalid calls."""
+    
+    def test_mixed_calls(self, monkeypatch):
+        """Test that invalid calls fail on their own and valid ones share one batch."""
+        validate_arguments = MCPToolProxy.validate_arguments
+        
+        def validate_or_fail(tool, **kwargs):
+            if tool.name == BROKEN_TOOL.name:
+                raise RuntimeError("schema unavailable")
+            return validate_arguments(tool, **kwargs)
+        
+        monkeypatch.setattr(MCPToolProxy, "validate_arguments", validate_or_fail)
+        
+        client = RecordingMCPClient(batches=[])
+        registry = ToolRegistry(RealEstateMCPToolSet(mcp_client=client))
+        
+        results = registry.execute_tools([
+            ToolCall(tool_name="search_properties_tool", arguments={"query": "pool"}),
+            ToolCall(tool_name="unknown_tool", arguments={}),
+            ToolCall(tool_name="search_properties_tool", arguments={"query": "loft", "size": "many"}),
+            ToolCall(tool_name="broken_tool", arguments={"query": "x"}),
+            ToolCall(tool_name="search_properties_tool", arguments={"query": "garden", "size": 2}),
+        ])
+        
+        assert [result.success for result in results] == [True, False, False, False, True]
+        assert results[0].result == "ok:pool"
+        assert results[1].error == "Unknown tool: unknown_tool"
+        assert "size" in results[2].error
+        assert results[3].error == "schema unavailable"
+        assert results[4].result == "ok:garden"
+        
+        # Only the valid calls reach the server, in one batch, without None values
+        assert len(client.batches) == 1
+        assert [call.arguments for call in client.batches[0]] == [
+            {"query": "pool"},
+            {"query": "garden", "size": 2}
+        ]
@@ -0,0 +1,91 @@
+"""Test the MCP result parsing helpers."""
+
+import json
+
+from tools.real_estate.result_parsing import (
+    ARTICLE_LIST_KEYS, BED_KEYS, TOTAL_KEYS, as_dict, first, load_json_items, preview_json
+)
+
+
+class TestFirst:
+    """Test alias-key lookup with first."""
+    
+    def test_first_alias_present(self):
+        """Test that the most common alias wins when several are present."""
+        assert first({"bedrooms": 3, "beds": 4}, BED_KEYS) == 3
+    
+    def test_alias_fallback(self):
+        """Test that a later alias is used when the first is missing."""
+        assert first({"beds": 4}, BED_KEYS) == 4
+    
+    def test_default_when_missing(self):
+        """Test that the default is returned when no alias is present."""
+        assert first({}, TOTAL_KEYS, 0) == 0
+        assert first({"other": 1}, TOTAL_KEYS) is None
+    
+    def test_none_value_is_kept(self):
+        """Test that a present None value is returned, not skipped."""
+        assert first({"total_results": None, "total": 5}, TOTAL_KEYS, 0) is None
+
+
+class TestAsDict:
+    """Test normalizing tool results with as_dict."""
+    
+    def test_json_object_text(self):
+        """Test that JSON object text is decoded."""
+        assert as_dict('{"total": 2}') == {"total": 2}
+    
+    def test_decoded_dict_is_copied(self):
+        """Test that an already decoded dict comes back as a new dict."""
+        raw = {"total": 2}
+        data = as_dict(raw)
+        assert data == raw
+        data["total"] = 3
+        assert raw == {"total": 2}
+    
+    def test_non_dict_input(self):
+        """Test that anything other than a JSON object maps to an empty dict."""
+        for raw in (None, 42, ["a"], "[1, 2]", '"text"', "not json", b"{broken"):
+            assert as_dict(raw) == {}
+
+
+class TestPreviewJson:
+    """Test bounded JSON previews."""
+    
+    def test_short_document_is_complete(self):
+        """Test that a document under the limit is rendered in full."""
+        data = {"status": "ok"}
+        assert preview_json(data) == json.dumps(data, indent=2)
+    
+    def test_long_document_is_truncated(self):
+        """Test that a long document is cut to the limit."""
+        data = {"items": list(range(1000))}
+        preview = preview_json(data, limit=50)
+        assert len(preview) == 50
+        assert preview == json.dumps(data, indent=2)[:50]
+
+
+class TestLoadJsonItems:
+    """Test load_json_items on well-formed and unexpected payloads."""
+    
+    def test_first_present_key_is_used(self):
+        """Test that the first alias present wins, even when it is empty."""
+        data = json.dumps({"articles": [], "results": [{"title": "B"}]})
+        assert load_json_items(data, ARTICLE_LIST_KEYS, 2) == []
+    
+    def test_alias_key_fallback(self):
+        """Test that a later alias is read when the first one is absent."""
+        data = json.dumps({"results": [{"title": "A"}, {"title": "B"}, {"title": "C"}]})
+        assert load_json_items(data, ARTICLE_LIST_KEYS, 2) == [{"title": "A"}, {"title": "B"}]
+    
+    def test_top_level_list(self):
+        """Test that a JSON list instead of an object yields no items."""
+        assert load_json_items(json.dumps([{"title": "A"}]), ARTICLE_LIST_KEYS, 2) == []
+    
+    def test_null_list_field(self):
+        """Test that a null list field yields no items."""
+        assert load_json_items(json.dumps({"articles": None}), ARTICLE_LIST_KEYS, 2) == []
+    
+    def test_non_json_text(self):
+        """Test that text that is not JSON yields no items."""
+        assert load_json_items("Service unavailable", ARTICLE_LIST_KEYS, 2) == []
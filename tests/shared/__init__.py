@@ -0,0 +1 @@
+# Shared module tests package
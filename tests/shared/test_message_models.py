@@ -0,0 +1,295 @@
+"""Test MessageList aggregates and ConversationHistory trimming and caching."""
+
+from typing import List, Optional
+
+import pytest
+
+from shared.message_models import (
+    ConversationHistory, Message, MessageList, ToolResult, ToolStatus, SUMMARY_KEY_POINTS
+)
+
+
+def recompute_iteration_count(messages: List[Message]) -> int:
+    """Count tool calls per assistant message, stopping a message at 'finish'."""
+    count = 0
+    for message in messages:
+        if message.role == "assistant":
+            for trajectory in message.trajectories:
+                if trajectory.tool_use:
+                    count += 1
+                    if trajectory.tool_use.tool_name == "finish":
+                        break
+    return count
+
+
+def recompute_tools_used(messages: List[Message]) -> List[str]:
+    """Unique tools called by the assistant, in first-use order, without 'finish'."""
+    tools = []
+    for message in messages:
+        if message.role == "assistant":
+            for trajectory in message.trajectories:
+                if trajectory.tool_use:
+                    tool_name = trajectory.tool_use.tool_name
+                    if tool_name != "finish" and tool_name not in tools:
+                        tools.append(tool_name)
+    return tools
+
+
+def recompute_last_observation(messages: List[Message]) -> Optional[ToolResult]:
+    """The most recent tool result."""
+    for message in reversed(messages):
+        for trajectory in reversed(message.trajectories):
+            if trajectory.tool_result:
+                return trajectory.tool_result
+    return None
+
+
+def recompute_is_complete(message_list: MessageList) -> bool:
+    """Finished in the last assistant message, or out of iterations."""
+    if not message_list.messages:
+        return False
+    for message in reversed(message_list.messages):
+        if message.role == "assistant":
+            if any(t.tool_use and t.tool_use.tool_name == "finish" for t in message.trajectories):
+                return True
+            break
+    return recompute_iteration_count(message_list.messages) >= message_list.max_iterations
+
+
+def recompute_llm_format(message_list: MessageList) -> str:
+    """Render the whole message list for the LLM from scratch."""
+    lines = [f"User Query: {message_list.user_query}\n"]
+    iteration = 0
+    for message in message_list.messages:
+        for trajectory in message.trajectories:
+            if message.role == "user":
+                if trajectory.text:
+                    lines.append(f"User: {trajectory.text}")
+                continue
+            if trajectory.thought:
+                iteration += 1
+                lines.append(f"Iteration {iteration}:")
+                lines.append(f"  Thought: {trajectory.thought}")
+            if trajectory.tool_use:
+                lines.append(f"  Tool: {trajectory.tool_use.tool_name}")
+                if trajectory.tool_use.tool_args:
+                    lines.append(f"  Args: {trajectory.tool_use.tool_args}")
+                if trajectory.tool_use.tool_name == "finish":
+                    lines.append("  Status: Task complete, ready for answer extraction")
+            if trajectory.tool_result:
+                if trajectory.tool_result.status == ToolStatus.SUCCESS:
+                    lines.append(f"  Result: {trajectory.tool_result.result}")
+                else:
+                    lines.append(f"  Error: {trajectory.tool_result.error}")
+    return "\n".join(lines)
+
+
+def assert_aggregates_match(message_list: MessageList) -> None:
+    """Compare every running aggregate with a fresh recomputation."""
+    messages = message_list.messages
+    assert message_list.iteration_count == recompute_iteration_count(messages)
+    assert message_list.tools_used == recompute_tools_used(messages)
+    assert message_list.last_observation == recompute_last_observation(messages)
+    assert message_list.total_execution_time_ms == pytest.approx(sum(
+        t.tool_result.execution_time_ms for m in messages for t in m.trajectories if t.tool_result
+    ))
+    assert message_list.is_complete == recompute_is_complete(message_list)
+    assert message_list.to_llm_format() == recompute_llm_format(message_list)
+
+
+def build_interaction(max_iterations: int = 10) -> MessageList:
+    """A user query, two tool calls with results (one failed) and a finish."""
+    message_list = MessageList(user_query="Find a home", tool_set_name="real_estate", max_iterations=max_iterations)
+    message_list.add_user_message("Find a home with a pool")
+    tool_use_id = message_list.add_assistant_message("Search first", "search_properties", {"query": "pool"})
+    message_list.add_tool_result(tool_use_id, "search_properties", ToolStatus.SUCCESS, result="3 homes", execution_time_ms=12.5)
+    tool_use_id = message_list.add_assistant_message("Check the area", "search_wikipedia", {"query": "Oakland"})
+    message_list.add_tool_result(tool_use_id, "search_wikipedia", ToolStatus.ERROR, error="timeout", execution_time_ms=30.0)
+    message_list.add_assistant_message("Search again", "search_properties", {"query": "pool", "size": 3})
+    message_list.add_assistant_message("Done", "finish")
+    return message_list
+
+
+class TestMessageListAggregates:
+    """Test that the running aggregates match a recomputation from the messages."""
+    
+    def test_after_each_append(self):
+        """Test the aggregates after every kind of append."""
+        message_list = MessageList(user_query="Find a home", tool_set_name="real_estate")
+        assert_aggregates_match(message_list)
+        
+        message_list.add_user_message("Find a home with a pool")
+        assert_aggregates_match(message_list)
+        
+        tool_use_id = message_list.add_assistant_message("Search first", "search_properties", {"query": "pool"})
+        assert_aggregates_match(message_list)
+        
+        message_list.add_tool_result(tool_use_id, "search_properties", ToolStatus.SUCCESS, result="3 homes", execution_time_ms=12.5)
+        assert_aggregates_match(message_list)
+        
+        # A result with no assistant message to join starts a new one
+        message_list.add_user_message("Only with a garden")
+        message_list.add_tool_result("orphan", "search_properties", ToolStatus.ERROR, error="late", execution_time_ms=1.0)
+        assert_aggregates_match(message_list)
+        
+        message_list.add_assistant_message("Done", "finish")
+        assert_aggregates_match(message_list)
+        assert message_list.is_complete
+        
+        # A new assistant message after 'finish' resumes the interaction
+        message_list.add_assistant_message("One more thing", "search_wikipedia", {"query": "schools"})
+        assert_aggregates_match(message_list)
+        assert not message_list.is_complete
+    
+    def test_finished_interaction(self):
+        """Test the aggregates of a full interaction."""
+        message_list = build_interaction()
+        assert_aggregates_match(message_list)
+        assert message_list.tools_used == ["search_properties", "search_wikipedia"]
+        assert message_list.iteration_count == 4
+        assert message_list.is_complete
+    
+    def test_max_iterations(self):
+        """Test that running out of iterations completes the interaction."""
+        message_list = MessageList(user_query="q", tool_set_name="t", max_iterations=2)
+        message_list.add_assistant_message("one", "search_properties")
+        assert not message_list.is_complete
+        message_list.add_assistant_message("two", "search_properties")
+        assert_aggregates_match(message_list)
+        assert message_list.is_complete
+    
+    def test_constructed_from_existing_messages(self):
+        """Test that messages passed at construction seed the aggregates."""
+        original = build_interaction()
+        rebuilt = MessageList(
+            messages=original.messages,
+            user_query=original.user_query,
+            tool_set_name=original.tool_set_name
+        )
+        assert_aggregates_match(rebuilt)
+        
+        # Appending to the new list leaves the original consistent
+        tool_use_id = rebuilt.add_assistant_message("Follow up", "get_property_details", {"id": "P1"})
+        rebuilt.add_tool_result(tool_use_id, "get_property_details", ToolStatus.SUCCESS, result="details", execution_time_ms=4.0)
+        assert_aggregates_match(rebuilt)
+        assert_aggregates_match(original)
+    
+    @pytest.mark.parametrize("deep", [False, True])
+    def test_model_copy(self, deep):
+        """Test that a copy and its original keep separate, correct aggregates."""
+        original = build_interaction()
+        original.add_assistant_message("Reopen", "search_properties", {"query": "loft"})
+        copied = original.model_copy(deep=deep)
+        assert_aggregates_match(copied)
+        
+        tool_use_id = copied.add_assistant_message("Follow up", "get_property_details", {"id": "P1"})
+        copied.add_tool_result(tool_use_id, "get_property_details", ToolStatus.SUCCESS, result="details", execution_time_ms=4.0)
+        assert_aggregates_match(copied)
+        assert_aggregates_match(original)
+        assert "get_property_details" not in original.tools_used
+        
+        # Tool use ids keep counting from the original's
+        assert tool_use_id.startswith("tool_6_")
+    
+    def test_model_copy_with_update(self):
+        """Test that replacing the messages in a copy rebuilds its aggregates."""
+        original = build_interaction()
+        copied = original.model_copy(update={"messages": original.messages[:2]})
+        assert_aggregates_match(copied)
+        assert copied.tools_used == ["search_properties"]
+
+
+def user_turn(*texts: str) -> MessageList:
+    """A message list holding one user message per text."""
+    message_list = MessageList(user_query=texts[0], tool_set_name="real_estate")
+    for text in texts:
+        message_list.add_user_message(text)
+    return message_list
+
+
+class TestConversationHistory:
+    """Test the sliding window, summaries and context prompt cache."""
+    
+    def test_add_messages_invalidates_prompt(self):
+        """Test that a cached prompt is rebuilt after messages are added."""
+        history = ConversationHistory()
+        history.add_messages(user_turn("first question"))
+        first_prompt = history.build_context_prompt()
+        assert history.build_context_prompt() is first_prompt
+        
+        history.add_messages(user_turn("second question"))
+        prompt = history.build_context_prompt()
+        assert prompt == "Previous conversation context:\nUser: first question\nUser: second question"
+    
+    def test_clear_history_invalidates_prompt(self):
+        """Test that clearing the history drops the cached prompt."""
+        history = ConversationHistory({"max_messages": 1})
+        history.add_messages(user_turn("first question", "second question"))
+        assert history.build_context_prompt()
+        
+        history.clear_history()
+        assert history.build_context_prompt() == ""
+        assert not history.messages and not history.summaries
+        
+        history.add_messages(user_turn("fresh start"))
+        assert history.build_context_prompt() == "Previous conversation context:\nUser: fresh start"
+    
+    def test_window_trims_oldest_first(self):
+        """Test that the window keeps the newest messages and summarizes the oldest."""
+        texts = ["one", "two", "three", "four", "five"]
+        history = ConversationHistory({"max_messages": 3})
+        history.add_messages(user_turn(*texts[:2]))
+        history.add_messages(user_turn(*texts[2:]))
+        
+        kept = [m.trajectories[0].text for m in history.messages]
+        assert 0 < len(kept) <= 3
+        assert kept == texts[-len(kept):]
+        
+        trimmed = texts[:-len(kept)]
+        assert history.summaries == [
+            "Earlier conversation: " + "; ".join(f"User asked: {text}..." for text in trimmed)
+        ]
+        assert history.build_context_prompt().splitlines() == [
+            "Previous conversation context:",
+            f"[Summary]: {history.summaries[0]}",
+            *(f"User: {text}" for text in kept)
+        ]
+    
+    def test_window_keeps_tool_pairs(self):
+        """Test that a cut landing on a tool use moves past its result."""
+        turn = MessageList(user_query="q", tool_set_name="real_estate")
+        turn.add_user_message("hello")
+        turn.add_user_message("find homes")
+        tool_use_id = turn.add_assistant_message("search", "search_properties", {"query": "homes"})
+        turn.add_user_message("while you look")
+        turn.add_tool_result(tool_use_id, "search_properties", ToolStatus.SUCCESS, result="3 homes")
+        turn.add_user_message("thanks")
+        
+        # Six messages with room for four: the cut starts at the tool use
+        history = ConversationHistory({"max_messages": 4})
+        history.add_messages(turn)
+        
+        kept_results = {t.tool_result.tool_use_id for m in history.messages for t in m.trajectories if t.tool_result}
+        assert tool_use_id not in kept_results
+        assert [m.trajectories[0].text for m in history.messages] == ["thanks"]
+    
+    def test_summary_key_point_limit(self):
+        """Test that a summary holds at most SUMMARY_KEY_POINTS key points."""
+        texts = [f"question {i}" for i in range(SUMMARY_KEY_POINTS + 3)]
+        history = ConversationHistory({"max_messages": 1})
+        history.add_messages(user_turn(*texts))
+        
+        (summary,) = history.summaries
+        key_points = summary.removeprefix("Earlier conversation: ").split("; ")
+        assert key_points == [f"User asked: question {i}..." for i in range(SUMMARY_KEY_POINTS)]
+    
+    def test_summaries_disabled(self):
+        """Test that trimmed messages are dropped silently when summaries are off."""
+        texts = ["one", "two", "three", "four"]
+        history = ConversationHistory({"max_messages": 2, "summarize_removed": False})
+        history.add_messages(user_turn(*texts))
+        
+        kept = [m.trajectories[0].text for m in history.messages]
+        assert len(kept) <= 2
+        assert kept == texts[len(texts) - len(kept):]
+        assert history.summaries == []
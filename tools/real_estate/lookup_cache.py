@@ -0,0 +1,134 @@
+"""Cache for Wikipedia lookups made through the MCP tools.
+
+Neighborhood and location articles rarely change, yet the demos look up the
+same (city, state) pairs again and again. LookupCache keeps successful
+results of the Wikipedia tools keyed by tool name and canonical arguments,
+in memory and optionally in a shelve file so later runs skip the server.
+"""
+import atexit
+import json
+import os
+import shelve
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from shared.models import ToolCall, ToolExecutionResult
+
+WIKIPEDIA_TOOLS = frozenset({"search_wikipedia_tool", "search_wikipedia_by_location_tool"})
+
+# Executes a list of tool calls and returns their results in order,
+# e.g. ToolRegistry.execute_tools
+ExecuteTools = Callable[[List[ToolCall]], List[ToolExecutionResult]]
+
+
+class LookupCache:
+    """LRU cache of successful tool results with optional on-disk persistence."""
+    
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttl: float = 24 * 60 * 60,
+        maxsize: int = 512,
+        tools: Iterable[str] = WIKIPEDIA_TOOLS
+    ):
+        """Initialize the cache.
+        
+        Args:
+            path: shelve file used to persist results across runs; memory only if None
+            ttl: Seconds a cached result stays valid
+            maxsize: Maximum number of results kept in memory
+            tools: Names of the tools whose results may be cached
+        """
+        self.path = path
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.tools = frozenset(tools)
+        self._memory: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        # Opened once for the life of the cache; released by close()
+        self._disk: Optional[shelve.Shelf] = shelve.open(path) if path else None
+    
+    def close(self) -> None:
+        """Close the shelve file, if one is open."""
+        if self._disk is not None:
+            self._disk.close()
+            self._disk = None
+    
+    @staticmethod
+    def key(tool_call: ToolCall) -> str:
+        """Build the cache key for a tool call from its name and sorted arguments."""
+        return f"{tool_call.tool_name}:{json.dumps(tool_call.arguments, sort_keys=True, default=str)}"
+    
+    def get(self, tool_call: ToolCall) -> Optional[ToolExecutionResult]:
+        """Return the cached result for a tool call, or None if absent or expired."""
+        if tool_call.tool_name not in self.tools:
+            return None
+        
+        key = self.key(tool_call)
+        entry = self._memory.get(key)
+        if entry is None and self._disk is not None:
+            entry = self._disk.get(key)
+        if entry is None:
+            return None
+        
+        stored_at, data = entry
+        if time.time() - stored_at > self.ttl:
+            self._memory.pop(key, None)
+            return None
+        
+        self._remember(key, entry)
+        return ToolExecutionResult.model_validate(data)
+    
+    def put(self, tool_call: ToolCall, result: ToolExecutionResult) -> None:
+        """Store a successful result for a cacheable tool call."""
+        if tool_call.tool_name not in self.tools or not result.success:
+            return
+        
+        key = self.key(tool_call)
+        entry = (time.time(), result.model_dump())
+        self._remember(key, entry)
+        if self._disk is not None:
+            self._disk[key] = entry
+    
+    def execute(self, execute_tools: ExecuteTools, tool_call: ToolCall) -> ToolExecutionResult:
+        """Execute a tool call, answering from the cache when possible.
+        
+        Args:
+            execute_tools: Runs the call on a cache miss, e.g. registry.execute_tools
+            tool_call: The tool call to execute
+        
+        Returns:
+            The cached or freshly executed result
+        """
+        return self.execute_batch(execute_tools, [tool_call])[0]
+    
+    def execute_batch(self, execute_tools: ExecuteTools, tool_calls: List[ToolCall]) -> List[ToolExecutionResult]:
+        """Execute several tool calls, sending only the cache misses as one batch.
+        
+        Args:
+            execute_tools: Runs the cache misses, e.g. registry.execute_tools
+            tool_calls: The tool calls to execute
+        
+        Returns:
+            Results in the same order as tool_calls
+        """
+        results: List[Optional[ToolExecutionResult]] = [self.get(call) for call in tool_calls]
+        misses = [index for index, result in enumerate(results) if result is None]
+        if misses:
+            fresh = execute_tools([tool_calls[index] for index in misses])
+            for index, result in zip(misses, fresh):
+                self.put(tool_calls[index], result)
+                results[index] = result
+        return results
+    
+    def _remember(self, key: str, entry: Tuple[float, Dict[str, Any]]) -> None:
+        """Insert an entry as most recently used, evicting the oldest beyond maxsize."""
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+
+# Shared by the demos; set MCP_LOOKUP_CACHE_PATH to keep results between runs
+wikipedia_cache = LookupCache(path=os.getenv("MCP_LOOKUP_CACHE_PATH"))
+atexit.register(wikipedia_cache.close)
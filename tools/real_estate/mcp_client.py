@@ -6,9 +6,12 @@ real_estate_ai_search project.
 """
 import asyncio
 import logging
-from typing import List, Dict, Any, Optional
+import time
+from typing import List, Dict, Any
 from pydantic import BaseModel, Field
 
+from shared.models import ToolCall, ToolExecutionResult
+
 # Import FastMCP client
 from fastmcp import Client
 
@@ -27,6 +30,7 @@ class MCPClient(BaseModel):
     """Simple MCP client that connects to the real estate MCP server."""
     
     server_url: str = Field(default="http://localhost:8000/mcp", description="MCP server URL")
+    max_concurrency: int = Field(default=8, ge=1, description="Maximum tool calls in flight at once")
     
     class Config:
         """Pydantic configuration."""
@@ -95,37 +99,116 @@ class MCPClient(BaseModel):
                 
                 # Call the tool
                 result = await client.call_tool(tool_name, arguments=arguments)
-                
-                # Parse result based on type
-                if hasattr(result, 'content'):
-                    # Handle MCP response format
-                    content = result.content
-                    if isinstance(content, list) and len(content) > 0:
-                        # Extract text content from first item
-                        first_item = content[0]
-                        if hasattr(first_item, 'text'):
-                            return first_item.text
-                        elif hasattr(first_item, 'data'):
-                            return first_item.data
-                        else:
-                            return str(first_item)
-                    return content
-                else:
-                    # Direct result
-                    return result
+                return self._parse_result(result)
                     
         except Exception as e:
             logger.error(f"Failed to execute tool {tool_name}: {e}")
             raise
+    
+    def call_tools(self, tool_calls: List[ToolCall]) -> List[ToolExecutionResult]:
+        """Execute several tools over a single MCP server session.
+        
+        All calls share one connection, opened for this batch, and are sent
+        concurrently, so the batch pays the connection setup once instead of
+        once per tool. At most max_concurrency calls are in flight at a time.
+        
+        Args:
+            tool_calls: Calls whose arguments are already validated
+            
+        Returns:
+            One result per call, in order. Each execution_time is the time that
+            call took once it had a slot, not the batch time
+        """
+        try:
+            return asyncio.run(self._call_tools(tool_calls))
+        except Exception as e:
+            # Connection-level failure: none of the calls ran
+            logger.error(f"Failed to execute batch of {len(tool_calls)} tools: {e}")
+            return [
+                ToolExecutionResult(
+                    tool_name=tool_call.tool_name,
+                    success=False,
+                    result=None,
+                    error=str(e),
+                    execution_time=0.0,
+                    parameters=tool_call.arguments
+                )
+                for tool_call in tool_calls
+            ]
+    
+    async def _call_tools(self, tool_calls: List[ToolCall]) -> List[ToolExecutionResult]:
+        """Open one session and run every call on it, max_concurrency at a time."""
+        async with Client(self.server_url) as client:
+            if not client.is_connected():
+                raise Exception("Failed to connect to MCP server")
+            
+            limiter = asyncio.Semaphore(self.max_concurrency)
+            return list(await asyncio.gather(
+                *(self._call_timed(client, limiter, tool_call) for tool_call in tool_calls)
+            ))
+    
+    @classmethod
+    async def _call_timed(cls, client: Client, limiter: asyncio.Semaphore, tool_call: ToolCall) -> ToolExecutionResult:
+        """Call a tool once a slot is free, timing only that call."""
+        async with limiter:
+            start_time = time.time()
+            try:
+                result = cls._parse_result(await client.call_tool(tool_call.tool_name, arguments=tool_call.arguments))
+            except Exception as e:
+                return ToolExecutionResult(
+                    tool_name=tool_call.tool_name,
+                    success=False,
+                    result=None,
+                    error=str(e),
+                    execution_time=time.time() - start_time,
+                    parameters=tool_call.arguments
+                )
+            return ToolExecutionResult(
+                tool_name=tool_call.tool_name,
+                success=True,
+                result=result,
+                error=None,
+                execution_time=time.time() - start_time,
+                parameters=tool_call.arguments
+            )
+    
+    @staticmethod
+    def _parse_result(result: Any) -> Any:
+        """Unwrap the content of an MCP tool response.
+        
+        Args:
+            result: Raw result returned by the FastMCP client
+            
+        Returns:
+            Text or data of the first content item, or the result itself
+        """
+        # Parse result based on type
+        if hasattr(result, 'content'):
+            # Handle MCP response format
+            content = result.content
+            if isinstance(content, list) and len(content) > 0:
+                # Extract text content from first item
+                first_item = content[0]
+                if hasattr(first_item, 'text'):
+                    return first_item.text
+                elif hasattr(first_item, 'data'):
+                    return first_item.data
+                else:
+                    return str(first_item)
+            return content
+        else:
+            # Direct result
+            return result
 
 
-def create_mcp_client(server_url: str = "http://localhost:8000/mcp") -> MCPClient:
+def create_mcp_client(server_url: str = "http://localhost:8000/mcp", max_concurrency: int = 8) -> MCPClient:
     """Create an MCP client instance.
     
     Args:
         server_url: URL of the MCP server
+        max_concurrency: Maximum tool calls in flight at once
         
     Returns:
         MCPClient instance
     """
-    return MCPClient(server_url=server_url)
\ No newline at end of file
+    return MCPClient(server_url=server_url, max_concurrency=max_concurrency)
\ No newline at end of file
@@ -57,13 +57,10 @@ class MCPToolProxy(BaseTool):
         # This is the key pattern from DSPy - using a closure to capture state
         async def execute_mcp_tool(**kwargs):
             """Execute the MCP tool with captured client."""
-            # Filter out None values - MCP server expects optional params to be omitted
-            filtered_kwargs = {k: v for k, v in kwargs.items() if v is not None}
-            
             # mcp_client and mcp_tool_info are captured from enclosing scope
             result = await mcp_client.call_tool(
                 tool_name=mcp_tool_info.name,
-                arguments=filtered_kwargs
+                arguments=MCPToolProxy.prepare_arguments(**kwargs)
             )
             return result
         
@@ -140,6 +137,19 @@ class MCPToolProxy(BaseTool):
         }
         return type_mapping.get(json_type, Any)
     
+    @staticmethod
+    def prepare_arguments(**kwargs) -> Dict[str, Any]:
+        """Shape validated arguments the way the MCP server expects.
+        
+        Args:
+            **kwargs: Validated tool arguments
+            
+        Returns:
+            The arguments with None values omitted
+        """
+        # Filter out None values - MCP server expects optional params to be omitted
+        return {k: v for k, v in kwargs.items() if v is not None}
+    
     def execute(self, **kwargs) -> Any:
         """Execute the MCP tool using the captured closure.
         
@@ -5,12 +5,15 @@ at runtime, implementing the instance-based approach without DSPy dependency.
 """
 import asyncio
 import logging
+import time
 from typing import List, Optional, Type
 from pydantic import BaseModel, Field, PrivateAttr
 import dspy
 
+from shared.models import ToolCall, ToolExecutionResult
 from shared.tool_utils.base_tool import BaseTool
 from shared.tool_utils.base_tool_sets import ToolSet, ToolSetConfig, ToolSetTestCase
+from shared.tool_utils.registry import ToolRegistry
 from .mcp_client import create_mcp_client, MCPClient
 from .mcp_proxy import MCPToolProxy
 
@@ -24,11 +27,19 @@ class RealEstateMCPToolSet(ToolSet):
     are discovered at runtime and provided as instances rather than classes.
     """
     
-    def __init__(self, server_url: str = "http://localhost:8000/mcp"):
+    def __init__(
+        self,
+        server_url: str = "http://localhost:8000/mcp",
+        max_concurrency: int = 8,
+        mcp_client: Optional[MCPClient] = None
+    ):
         """Initialize MCP tool set with server URL.
         
         Args:
             server_url: URL of the MCP server
+            max_concurrency: Maximum tool calls in flight at once
+            mcp_client: Existing client to share; server_url and
+                max_concurrency are ignored when it is given
         """
         # Create config without tool_classes (we provide instances)
         config = ToolSetConfig(
@@ -40,7 +51,7 @@ class RealEstateMCPToolSet(ToolSet):
         super().__init__(config=config)
         
         # Store instance data directly in __dict__ to avoid Pydantic issues
-        self.__dict__['_mcp_client'] = create_mcp_client(server_url)
+        self.__dict__['_mcp_client'] = mcp_client if mcp_client is not None else create_mcp_client(server_url, max_concurrency)
         self.__dict__['_tool_instances'] = []
         self.__dict__['_discovered'] = False
     
@@ -104,6 +115,47 @@ class RealEstateMCPToolSet(ToolSet):
         """
         return self.__dict__.get('_tool_instances', [])
     
+    def execute_batch(self, registry: ToolRegistry, tool_calls: List[ToolCall]) -> List[ToolExecutionResult]:
+        """Execute several MCP tool calls over a single server session.
+        
+        Arguments are validated per tool, exactly as execute_tool does, before
+        anything is sent; calls that fail validation or name an unknown tool
+        take the registry's single-call path for their error result without
+        affecting the rest of the batch. Each result's execution_time is the
+        time of that call alone, not of the whole batch.
+        
+        Args:
+            registry: The registry the tool set is registered with
+            tool_calls: The tool calls to execute
+            
+        Returns:
+            Results in the same order as tool_calls
+        """
+        start_time = time.time()
+        results: List[Optional[ToolExecutionResult]] = [None] * len(tool_calls)
+        pending = []  # (index, call with arguments shaped for the server)
+        
+        for index, tool_call in enumerate(tool_calls):
+            tool = registry.get_tool(tool_call.tool_name)
+            if tool is not None:
+                try:
+                    arguments = MCPToolProxy.prepare_arguments(**tool.validate_arguments(**tool_call.arguments))
+                    pending.append((index, ToolCall(tool_name=tool_call.tool_name, arguments=arguments)))
+                    continue
+                except Exception:
+                    pass
+            # Unknown tool or invalid arguments: nothing would reach the
+            # server, so the single-call path reports the error
+            results[index] = registry.execute_tool(tool_call)
+        
+        if pending:
+            sent = self.__dict__['_mcp_client'].call_tools([call for _, call in pending])
+            for (index, _), result in zip(pending, sent):
+                results[index] = result
+        
+        logger.info(f"Executed batch of {len(tool_calls)} MCP tool calls in {time.time() - start_time:.3f}s")
+        return results
+    
     @classmethod
     def get_test_cases(cls) -> List[ToolSetTestCase]:
         """Return test cases for the real estate MCP tools.
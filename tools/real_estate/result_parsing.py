@@ -0,0 +1,138 @@
+"""Parsing helpers for MCP tool results.
+
+MCP tools return their payload as JSON text. These helpers decode it and
+read the fields the demos display, whichever alias a tool used for them.
+"""
+import json
+from typing import Any, Dict, Iterable, List, Sequence, Union
+
+from pydantic import TypeAdapter, ValidationError
+
+# Indented encoder for previews; iterencode lets a preview stop early
+_PREVIEW_ENCODER = json.JSONEncoder(indent=2)
+
+# Validates that a decoded result is a JSON object, copying it into a new dict
+_JSON_OBJECT = TypeAdapter(Dict[str, Any])
+
+# Sentinel for first(); None is a legitimate field value
+_MISSING = object()
+
+# Field aliases used by the MCP tools, most common name first
+LIST_KEYS = ('properties', 'results')
+ARTICLE_LIST_KEYS = ('articles', 'results')
+TOTAL_KEYS = ('total_results', 'total')
+RETURNED_KEYS = ('returned_results', 'count')
+ID_KEYS = ('id', 'property_id', 'listing_id')
+TYPE_KEYS = ('property_type', 'type')
+BED_KEYS = ('bedrooms', 'beds')
+BATH_KEYS = ('bathrooms', 'baths')
+SQFT_KEYS = ('square_feet', 'sqft')
+DESCRIPTION_KEYS = ('description', 'summary')
+ADDRESS_KEYS = ('address', 'location')
+SCORE_KEYS = ('relevance_score', 'score', 'similarity')
+TITLE_KEYS = ('title', 'name')
+SUMMARY_KEYS = ('summary', 'content', 'description')
+AMENITY_KEYS = ('amenities', 'features')
+TIMESTAMP_KEYS = ('timestamp', 'checked_at')
+
+
+def first(data: Dict[str, Any], keys: Sequence[str], default: Any = None) -> Any:
+    """Return the value of the first key present in data.
+    
+    Replaces nested fallbacks like data.get('a', data.get('b', x)), which
+    look up every alias even when the first one is present.
+    
+    Args:
+        data: Dictionary to read from
+        keys: Candidate keys, most likely first
+        default: Value returned when none of the keys is present
+        
+    Returns:
+        The value stored under the first present key, or default
+    """
+    get = data.get
+    for key in keys:
+        value = get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+    return default
+
+
+def bounded_join(parts: Iterable[str], limit: int) -> str:
+    """Join string parts, consuming only as many as needed for `limit` characters.
+    
+    Args:
+        parts: String fragments, typically produced lazily
+        limit: Maximum length of the result
+        
+    Returns:
+        The concatenated text, cut to at most `limit` characters
+    """
+    out = []
+    size = 0
+    for part in parts:
+        out.append(part)
+        size += len(part)
+        if size >= limit:
+            break
+    return "".join(out)[:limit]
+
+
+def preview_json(data: Any, limit: int = 500) -> str:
+    """Render the start of data as indented JSON, for display.
+    
+    The document is encoded incrementally and encoding stops once `limit`
+    characters exist, so previewing a large result never serializes all of it.
+    
+    Args:
+        data: JSON-serializable object
+        limit: Maximum length of the preview
+        
+    Returns:
+        At most `limit` characters of the indented JSON text
+    """
+    return bounded_join(_PREVIEW_ENCODER.iterencode(data), limit)
+
+
+def as_dict(raw: Any) -> Dict[str, Any]:
+    """Normalize a tool result to a dictionary.
+    
+    Tool results arrive either as JSON text or as already decoded data. This
+    decodes text when needed and maps anything that is not a JSON object
+    (None, malformed JSON, lists, scalars) to an empty dict, so callers can
+    use .get() without further type checks.
+    
+    Args:
+        raw: Result returned by a tool execution
+        
+    Returns:
+        A new dict holding the object's fields, or an empty dict
+    """
+    try:
+        raw = json.loads(raw)
+    except TypeError:
+        pass  # Already decoded by the MCP client
+    except json.JSONDecodeError:
+        return {}
+    try:
+        return _JSON_OBJECT.validate_python(raw)
+    except ValidationError:
+        return {}
+
+
+def load_json_items(data: Union[str, bytes, bytearray], keys: Sequence[str], limit: int) -> List[Any]:
+    """Decode the first items of a list field in a JSON object.
+    
+    MCP results name their list field differently ("articles" or "results"),
+    so the value of the first key present is used, even when it is empty.
+    
+    Args:
+        data: JSON document as text or bytes
+        keys: Candidate top-level keys holding the list, most likely first
+        limit: Maximum number of items to return
+        
+    Returns:
+        Up to `limit` items, or an empty list if the data is not a JSON
+        object or its list field is missing or null
+    """
+    return (first(as_dict(data), keys) or [])[:limit]